@@ -0,0 +1,104 @@
+"""Benchmark the start-up of the handler, up to its first rendered action.
+
+Each start runs in a new process: without the bytecode cache, with an empty one,
+and with the one filled by the previous start. Also compares looking up templates
+with and without checking their files for changes.
+Run with `uv run python benchmarks/bench_cold_start.py`.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+from markdown import Markdown
+
+from mkdocstrings_handlers.github import GitHubConfig, GitHubHandler
+from mkdocstrings_handlers.github.repository import Repository
+
+ROOT = Path(__file__).parent.parent
+STARTS = 5
+LOOKUPS = 5000
+
+
+def start(cache_dir: str | None) -> tuple[float, GitHubHandler]:
+    """Create a handler and render the action at the root of the repository, in seconds.
+
+    Modules are imported beforehand, their import time does not depend on the cache.
+    """
+    started = timeit.default_timer()
+    # Render the action again in every process, the bytecode cache is what is compared.
+    config = GitHubConfig(
+        cache=cache_dir is not None, cache_dir=cache_dir or ".cache", render_cache_size=0
+    )
+    handler = GitHubHandler(
+        config=config,
+        repo=Repository.open(ROOT),
+        base_dir=ROOT,
+        theme="material",
+        custom_templates=None,
+        mdx=["toc"],
+        mdx_config={},
+    )
+    handler._update_env(Markdown(extensions=["toc"]), config=None)
+    options = handler.get_options({})
+    handler.render(handler.collect(".", options), options)
+    return timeit.default_timer() - started, handler
+
+
+def child() -> None:
+    seconds, _handler = start(sys.argv[2] or None)
+    print(seconds)
+
+
+def measure(cache_dirs: list[str]) -> float:
+    """Return the fastest start in a new process with each cache directory, in seconds."""
+    environ = {**os.environ, "GITHUB_ACTIONS": "true", "GITHUB_REPOSITORY": "owner/repo"}
+    runs = []
+    for cache_dir in cache_dirs:
+        result = subprocess.run(
+            [sys.executable, __file__, "--child", cache_dir],
+            capture_output=True,
+            check=True,
+            env=environ,
+            text=True,
+        )
+        runs.append(float(result.stdout))
+    return min(runs)
+
+
+def main() -> None:
+    print(f"start-up to the first render (best of {STARTS} processes)")
+    baseline = measure([""] * STARTS)
+    print(f"  {'no bytecode cache':<24} {baseline * 1000:8.1f} ms")
+    with tempfile.TemporaryDirectory() as directory:
+        empty = [str(Path(directory, f"empty-{index}")) for index in range(STARTS)]
+        warm = str(Path(directory, "warm"))
+        measure([warm])
+        for label, cache_dirs in (
+            ("empty bytecode cache", empty),
+            ("warm bytecode cache", [warm] * STARTS),
+        ):
+            seconds = measure(cache_dirs)
+            print(f"  {label:<24} {seconds * 1000:8.1f} ms   speedup {baseline / seconds:4.1f}x")
+
+    os.environ.update(GITHUB_ACTIONS="true", GITHUB_REPOSITORY="owner/repo")
+    _seconds, handler = start(None)
+    print(f"{LOOKUPS} template lookups")
+    for auto_reload in (True, False):
+        handler.env.auto_reload = auto_reload
+        seconds = timeit.timeit(
+            lambda: handler.env.get_template("action.html.jinja"), number=LOOKUPS
+        )
+        print(f"  {'auto_reload ' + str(auto_reload).lower():<24} {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        child()
+    else:
+        main()
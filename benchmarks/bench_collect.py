@@ -0,0 +1,79 @@
+"""Benchmark collecting a batch of workflows in the current process and in worker processes.
+
+Compares `collect_many` with `collect_workers: 1` against the process pool, for batches
+around `collect_parallel_threshold`. The pool is started before timing, like it is after
+the first batch of a build. Run with `uv run python benchmarks/bench_collect.py`.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import timeit
+from pathlib import Path
+
+import git
+from bench_parse import generate_workflow
+
+from mkdocstrings_handlers.github import GitHubConfig, GitHubHandler
+from mkdocstrings_handlers.github.config import GitHubOptions
+from mkdocstrings_handlers.github.repository import Repository
+
+BATCHES = (2, 4, 8, 16, 32, 64)
+LINES = 1000
+
+
+def handler(root: Path, workers: int) -> GitHubHandler:
+    """Create a handler for the repository, parsing with the given number of processes."""
+    return GitHubHandler(
+        config=GitHubConfig(collect_workers=workers, collect_parallel_threshold=0),
+        repo=Repository.open(root),
+        base_dir=root,
+        theme="material",
+        custom_templates=None,
+        mdx=[],
+        mdx_config={},
+    )
+
+
+def bench(handler: GitHubHandler, identifiers: list[str]) -> float:
+    """Return the fastest collection of all identifiers, without in-memory cache, in seconds."""
+
+    def collect() -> None:
+        handler.collected.clear()
+        handler.collect_many(identifiers, GitHubOptions())
+
+    return min(timeit.repeat(collect, number=1, repeat=3))
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        repo = git.Repo.init(root)
+        workflows = root / ".github" / "workflows"
+        workflows.mkdir(parents=True)
+        source = generate_workflow(LINES)
+        identifiers = []
+        for index in range(max(BATCHES)):
+            (workflows / f"workflow-{index}.yml").write_text(source, encoding="utf-8")
+            identifiers.append(f".github/workflows/workflow-{index}.yml")
+        repo.index.add(identifiers)
+
+        serial = handler(root, workers=1)
+        parallel = handler(root, workers=os.cpu_count() or 1)
+        # Start the workers, which import the handler once.
+        parallel.collect_many(identifiers[:2], GitHubOptions())
+
+        print(f"workflows of {LINES} lines, {parallel.workers} worker processes")
+        for batch in BATCHES:
+            before = bench(serial, identifiers[:batch])
+            after = bench(parallel, identifiers[:batch])
+            print(
+                f"  {batch:3d} files   serial {before * 1000:8.1f} ms"
+                f"   pool {after * 1000:8.1f} ms   speedup {before / after:4.1f}x"
+            )
+        parallel.teardown()
+
+
+if __name__ == "__main__":
+    main()
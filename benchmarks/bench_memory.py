@@ -0,0 +1,71 @@
+"""Benchmark the memory retained by collected parameters.
+
+Compares the slotted, interned object model with the previous model of plain dataclasses
+keeping the strings returned by the YAML loader. Run with `uv run python benchmarks/bench_memory.py`.
+"""
+
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from dataclasses import dataclass
+
+from mkdocstrings_handlers.github.objects import Input, _parameter, safe_yaml
+
+FILES = 50
+INPUTS_PER_FILE = 40
+
+
+@dataclass
+class LegacyInput:
+    name: str
+    description: str = ""
+    required: bool = False
+    type: str = "string"
+    default: bool | float | int | str | None = None
+    deprecationMessage: str | None = None
+    group: str = ""
+
+
+def generate_workflow(index: int) -> str:
+    """Generate a workflow whose inputs share descriptions, types and groups with other files."""
+    lines = ["on:", "  workflow_call:", "    inputs:"]
+    for number in range(INPUTS_PER_FILE):
+        lines += [
+            f"      input-{number}:",
+            f"        description: '{'GitHub token' if number % 2 else f'Input {number} of {index}'}'",
+            f"        type: {('string', 'boolean', 'number')[number % 3]}",
+            "        required: false",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def measure(build) -> int:
+    """Return the memory retained by the objects built from all generated workflows."""
+    sources = [generate_workflow(index) for index in range(FILES)]
+    gc.collect()
+    tracemalloc.start()
+    retained = []
+    for index, source in enumerate(sources):
+        data = safe_yaml.load(source)
+        for key, value in data["on"]["workflow_call"]["inputs"].items():
+            retained.append(build(key, value, f"group-{index % 5}"))
+        del data
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current
+
+
+def main() -> None:
+    parameters = FILES * INPUTS_PER_FILE
+    before = measure(lambda key, value, group: LegacyInput(name=key, **value, group=group))
+    after = measure(lambda key, value, group: _parameter(Input, key, value, group))
+    print(f"{parameters} inputs in {FILES} files")
+    print(f"  before {before / parameters * 1000 / 1024:8.1f} KiB per 1000 parameters")
+    print(f"  after  {after / parameters * 1000 / 1024:8.1f} KiB per 1000 parameters")
+    print(f"  saved  {1 - after / before:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
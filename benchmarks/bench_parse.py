@@ -0,0 +1,80 @@
+"""Benchmark the `roundtrip`, `fast` and `stream` parse modes.
+
+Run with `uv run python benchmarks/bench_parse.py`.
+"""
+
+from __future__ import annotations
+
+import tempfile
+import timeit
+import tracemalloc
+from pathlib import Path
+
+from mkdocstrings_handlers.github.objects import Action, Workflow, read_file
+
+ROOT = Path(__file__).parent.parent
+
+
+def generate_workflow(lines: int) -> str:
+    """Generate a reusable workflow of roughly the given number of lines."""
+    parts = ["name: 'Generated Workflow'", "on:", "  workflow_call:", "    inputs:"]
+    for index in range(lines // 20):
+        parts += [
+            f"      input-{index}: # group: group-{index % 7}",
+            f"        description: 'Input number {index}'",
+            "        required: false",
+            "        type: string",
+            f"        default: 'value-{index}'",
+        ]
+    parts += ["permissions:", "  contents: read", "jobs:"]
+    job = 0
+    while len(parts) < lines:
+        parts += [f"  job-{job}:", "    runs-on: ubuntu-latest", "    steps:"]
+        for step in range(5):
+            parts += [
+                f"      - name: Step {step}",
+                "        run: |",
+                *(f"          echo 'line {line} of step {step}'" for line in range(6)),
+            ]
+        job += 1
+    return "\n".join(parts) + "\n"
+
+
+def bench(label: str, parse, number: int) -> None:
+    print(label)
+    baseline = None
+    for mode in ("roundtrip", "fast", "stream"):
+        seconds = min(timeit.repeat(lambda: parse(mode), number=number, repeat=5)) / number
+        tracemalloc.start()
+        parse(mode)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        baseline = baseline or seconds
+        print(
+            f"  {mode:<10} {seconds * 1000:8.2f} ms   speedup {baseline / seconds:4.1f}x"
+            f"   peak {peak / 1024:8.0f} KiB"
+        )
+
+
+def main() -> None:
+    action_file = ROOT / "action.yaml"
+    action_source = read_file(action_file)
+    bench(
+        f"action.yaml ({action_source.count(chr(10))} lines)",
+        lambda mode: Action.from_source(action_source, action_file, ".", mode),
+        number=50,
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        workflow_file = Path(directory) / "workflow.yml"
+        workflow_file.write_text(generate_workflow(5000), encoding="utf-8")
+        workflow_source = read_file(workflow_file)
+        bench(
+            f"workflow ({workflow_source.count(chr(10))} lines)",
+            lambda mode: Workflow.from_source(workflow_source, workflow_file, "w.yml", mode),
+            number=3,
+        )
+
+
+if __name__ == "__main__":
+    main()
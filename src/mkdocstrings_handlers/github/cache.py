@@ -0,0 +1,378 @@
+"""Caches for collected objects, rendered HTML and highlighted source code."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import re
+import shutil
+from collections import OrderedDict
+from collections.abc import Hashable, Mapping
+from copy import deepcopy
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Generic, TypeVar
+
+from markupsafe import Markup
+from mkdocstrings import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from xml.etree.ElementTree import Element
+
+CACHE_FORMAT = 6
+"""Version of the pickled object model. Bump when `objects` changes in an incompatible way."""
+
+_logger = get_logger(__name__)
+
+_VERSION_DIR_RE = re.compile(r"^\d+(?:\.\d+)*[\w.+!]*-\d+$")
+"""Names of the `<handler version>-<CACHE_FORMAT>` directories created by `DiskCache`."""
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+def handler_version() -> str:
+    """Return the installed version of the handler."""
+    try:
+        return version("mkdocstrings-github")
+    except PackageNotFoundError:
+        return "0.0.0"
+
+
+def content_hash(content: str | bytes) -> str:
+    """Return the hex digest used to identify a file's content."""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+class DiskCache:
+    """A versioned on-disk cache of pickled values with size-based eviction.
+
+    Entries are stored in a directory named after the handler version and `CACHE_FORMAT`,
+    so that upgrading the handler invalidates all previous entries. When the total size of
+    the entries exceeds `max_size`, the least recently used entries are evicted.
+    """
+
+    def __init__(self, directory: Path, max_size: int) -> None:
+        """
+        Initialize the cache in the given directory.
+
+        Args:
+            directory: The root directory of the cache.
+            max_size: The maximum total size of the cache entries in bytes.
+        """
+        self.root = directory
+        self.directory = directory / f"{handler_version()}-{CACHE_FORMAT}"
+        self.max_size = max_size
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._remove_stale_versions()
+        self._size = sum(entry.stat().st_size for entry in self.directory.glob("*.pickle"))
+
+    def _remove_stale_versions(self) -> None:
+        # The root may be shared with other tools, only remove the directories of this class.
+        for entry in self.root.iterdir():
+            if entry.is_dir() and entry != self.directory and _VERSION_DIR_RE.match(entry.name):
+                _logger.debug(f"Removing stale cache directory '{entry}'.")
+                shutil.rmtree(entry, ignore_errors=True)
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        """Return the cache key for the given parts, e.g. a path and a content hash."""
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.directory / f"{key}.pickle"
+
+    def get(self, key: str) -> Any | None:
+        """Return the value stored under `key`, or `None` if there is none."""
+        entry = self._entry(key)
+        try:
+            with open(entry, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            _logger.debug(f"Discarding unreadable cache entry '{entry}': {e}")
+            self._discard(entry)
+            return None
+        # Mark the entry as recently used for eviction.
+        os.utime(entry)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store `value` under `key`, evicting old entries if the cache grows too large."""
+        entry = self._entry(key)
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        previous = entry.stat().st_size if entry.exists() else 0
+        temporary = entry.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_bytes(payload)
+        os.replace(temporary, entry)
+        self._size += len(payload) - previous
+        if self._size > self.max_size:
+            self._evict()
+
+    def _discard(self, entry: Path) -> None:
+        try:
+            size = entry.stat().st_size
+            entry.unlink()
+        except FileNotFoundError:
+            return
+        self._size -= size
+
+    def _evict(self) -> None:
+        entries = sorted(self.directory.glob("*.pickle"), key=lambda entry: entry.stat().st_mtime)
+        for entry in entries:
+            if self._size <= self.max_size:
+                break
+            _logger.debug(f"Evicting cache entry '{entry.name}'.")
+            self._discard(entry)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        for entry in self.directory.glob("*.pickle"):
+            self._discard(entry)
+
+
+class LRUCache(Generic[K, V]):
+    """A bounded in-memory mapping that discards the least recently used items."""
+
+    def __init__(self, max_size: int, on_evict: Callable[[V], None] | None = None) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_size: The maximum number of items to keep. A size of 0 disables the cache.
+            on_evict: Called with every item that is discarded to make room for another.
+        """
+        self.max_size = max_size
+        self.on_evict = on_evict
+        self._items: OrderedDict[K, V] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._items
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """Return the item stored under `key` and mark it as recently used."""
+        try:
+            self._items.move_to_end(key)
+        except KeyError:
+            return default
+        return self._items[key]
+
+    def set(self, key: K, value: V) -> None:
+        """Store `value` under `key`, discarding the least recently used item if full."""
+        if self.max_size <= 0:
+            return
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            _, evicted = self._items.popitem(last=False)
+            if self.on_evict is not None:
+                self.on_evict(evicted)
+
+    def pop(self, key: K, default: V | None = None) -> V | None:
+        """Remove and return the item stored under `key`."""
+        return self._items.pop(key, default)
+
+    def clear(self) -> None:
+        """Remove all items."""
+        self._items.clear()
+
+
+_RELATIVE_URL_RE = re.compile(r"""\b(?:href|src)=["'](?![a-zA-Z][\w+.-]*:|[#/?])""")
+"""Links that MkDocs rewrites relative to the page being built."""
+
+
+@dataclass(frozen=True)
+class Rendered:
+    """The HTML of a rendered object or description, with the headings it registered for the table of contents."""
+
+    html: str
+    headings: list[Element]
+
+    @property
+    def page_dependent(self) -> bool:
+        """Whether the HTML has relative links, which depend on the page it is rendered on."""
+        return _RELATIVE_URL_RE.search(self.html) is not None
+
+    def replay(self) -> list[Element]:
+        """Return copies of the headings, which the caller is free to modify."""
+        return [deepcopy(heading) for heading in self.headings]
+
+
+class RenderCache:
+    """A cache of rendered objects, in memory and optionally on disk.
+
+    Entries are keyed by named components, like a fingerprint of the object and a hash of the options.
+    HTML without relative links is shared between pages. Every miss is logged with the components
+    that changed since the previous render of the same object.
+    """
+
+    def __init__(self, max_size: int, disk_cache: DiskCache | None = None) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_size: The maximum number of entries to keep in memory. A size of 0 disables the cache.
+            disk_cache: The on-disk tier, if any.
+        """
+        self.memory: LRUCache[str, Rendered] = LRUCache(max_size)
+        self.disk_cache = disk_cache
+        self._previous: dict[str, dict[str, str]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.memory.max_size > 0
+
+    @staticmethod
+    def key(components: Mapping[str, str]) -> str:
+        """Return the key of an entry from its components."""
+        return DiskCache.key(
+            "render", *(f"{name}={value}" for name, value in sorted(components.items()))
+        )
+
+    def get(self, identifier: str, components: Mapping[str, str], page: str) -> Rendered | None:
+        """Return the entry shared by all pages, or else the one rendered on the given page."""
+        if not self.enabled:
+            return None
+        rendered = self._get({**components, "page": ""}) or self._get({**components, "page": page})
+        current = {**components, "page": page}
+        if rendered is None:
+            previous = self._previous.get(identifier)
+            if previous is None:
+                reason = "not rendered yet"
+            elif changed := [
+                name for name, value in current.items() if previous.get(name) != value
+            ]:
+                reason = "changed " + ", ".join(changed)
+            else:
+                reason = "evicted"
+            _logger.debug(f"Rendering '{identifier}' ({reason}).")
+        self._previous[identifier] = current
+        return rendered
+
+    def _get(self, components: Mapping[str, str]) -> Rendered | None:
+        key = self.key(components)
+        rendered = self.memory.get(key)
+        if rendered is None and self.disk_cache is not None:
+            rendered = self.disk_cache.get(key)
+            if rendered is not None:
+                self.memory.set(key, rendered)
+        return rendered
+
+    def set(self, components: Mapping[str, str], page: str, rendered: Rendered) -> None:
+        """Store an entry, for the given page only if its HTML depends on the page."""
+        if not self.enabled:
+            return
+        key = self.key({**components, "page": page if rendered.page_dependent else ""})
+        self.memory.set(key, rendered)
+        if self.disk_cache is not None:
+            self.disk_cache.set(key, rendered)
+
+
+def highlighter_fingerprint(highlighter: object) -> str:
+    """Return a hash of the settings and the versions a highlighter's output depends on.
+
+    Arguments:
+        highlighter: The highlighter configured by mkdocstrings from the Markdown extensions.
+    """
+    settings = sorted(
+        (name, repr(value)) for name, value in vars(highlighter).items() if name != "md"
+    )
+    return content_hash(repr((settings, _highlighting_versions())))
+
+
+def markdown_fingerprint(extensions: Sequence[Any], extension_configs: Mapping[str, Any]) -> str:
+    """Return a hash of the Markdown extensions and their configuration, stable across builds.
+
+    Functions, like the `slugify` of `toc`, and extension instances are identified by their
+    qualified name rather than their address.
+
+    Arguments:
+        extensions: The Markdown extensions, by name or instance.
+        extension_configs: The configuration of the extensions, by name.
+    """
+    return content_hash(
+        json.dumps([extensions, extension_configs], default=_qualified_name, sort_keys=True)
+    )
+
+
+def _qualified_name(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    kind = value if callable(value) and hasattr(value, "__qualname__") else type(value)
+    name = f"{kind.__module__}.{kind.__qualname__}"
+    if hasattr(value, "getConfigs"):
+        # An extension instance, like the ones added by MkDocs plugins.
+        return [name, value.getConfigs()]
+    return name
+
+
+@lru_cache(maxsize=None)
+def _highlighting_versions() -> tuple[str, ...]:
+    versions = []
+    for package in ("pygments", "pymdown-extensions"):
+        try:
+            versions.append(version(package))
+        except PackageNotFoundError:
+            versions.append("")
+    return tuple(versions)
+
+
+class HighlightCache:
+    """A cache of highlighted code, in memory and optionally on disk.
+
+    Entries are keyed by the hash of the code, the highlighting arguments, like the language
+    and line numbers, and the fingerprint of the highlighter configuration.
+    """
+
+    def __init__(self, max_size: int, disk_cache: DiskCache | None = None) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_size: The maximum number of entries to keep in memory. A size of 0 disables the cache.
+            disk_cache: The on-disk tier, if any.
+        """
+        self.memory: LRUCache[str, str] = LRUCache(max_size)
+        self.disk_cache = disk_cache
+
+    @property
+    def enabled(self) -> bool:
+        return self.memory.max_size > 0
+
+    def wrap(self, highlight: Callable[..., str], fingerprint: str) -> Callable[..., Markup]:
+        """Return a `highlight` filter that only calls `highlight` for code it has not seen yet.
+
+        Arguments:
+            highlight: The highlight filter to wrap.
+            fingerprint: The fingerprint of the highlighter configuration.
+        """
+        if not self.enabled:
+            return highlight
+
+        @wraps(highlight)
+        def cached(src: str, *args: Any, **kwargs: Any) -> Markup:
+            # Markup is unescaped before highlighting, so it must not share entries with plain text.
+            arguments = repr((isinstance(src, Markup), args, sorted(kwargs.items())))
+            key = DiskCache.key("highlight", fingerprint, arguments, content_hash(src))
+            html = self.memory.get(key)
+            if html is None and self.disk_cache is not None:
+                html = self.disk_cache.get(key)
+            if html is None:
+                html = str(highlight(src, *args, **kwargs))
+                if self.disk_cache is not None:
+                    self.disk_cache.set(key, html)
+            self.memory.set(key, html)
+            return Markup(html)
+
+        return cached
@@ -6,7 +6,7 @@ import sys
 from typing import Literal
 
 from mkdocstrings import get_logger
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 # YORE: EOL 3.10: Replace block with line 2.
 if sys.version_info >= (3, 11):
@@ -22,6 +22,7 @@ SIGNATURE_VERSION = Literal["ref", "major", "semver", "string"]
 PARAMETERS_ORDER = Literal["alphabetical", "source"]
 PARAMETERS_SECTION_STYLE = Literal["table", "list"]
 STEP_DIRECTION = Literal["TB", "LR"]
+PARSE_MODE = Literal["roundtrip", "fast", "stream"]
 
 
 class GitHubOptions(BaseModel):
@@ -45,6 +46,15 @@ class GitHubOptions(BaseModel):
         description="Whether to show the source link in the documentation.",
     )
 
+    diff_ref: str = Field(
+        default="",
+        description="""A git ref, e.g. the previous release tag, to compare the action or workflow with.
+
+        When set, a table lists the inputs, outputs, secrets and permissions that were added, removed or changed since this ref.
+        The previous version is read from the git objects of the repository.
+        """,
+    )
+
     # Heading options
     show_heading: bool = Field(
         default=True,
@@ -115,7 +125,9 @@ class GitHubOptions(BaseModel):
         default="ref",
         description="""The versioning scheme to use for the signature.
 
-        - `ref`: use the git ref (branch or tag) from which the workflow or action is run,
+        - `ref`: use the git ref (branch or tag) from which the workflow or action is run.
+            In GitHub Actions, this is `GITHUB_HEAD_REF` or `GITHUB_REF_NAME`. On a detached HEAD,
+            the release tag pointing to it is used, or its short commit SHA,
         - `major`: use the latest release tag matching `vX` (e.g. `v1`, `v2`),
         - `semver`: use the latest release tag matching `vX.X.X` (e.g. `v1.0.0`, `v2.1.3`),
         - `string`: use the string provided in the [`signature_version_string`][mkdocstrings_handlers.github.config.GitHubOptions.signature_version_string] option.
@@ -127,6 +139,26 @@ class GitHubOptions(BaseModel):
         description="The version string to use if [`signature_version`][mkdocstrings_handlers.github.config.GitHubOptions.signature_version] is set to `string`.",
     )
 
+    signature_tag_prefix: str = Field(
+        default="",
+        description="""The prefix of the release tags used by the `major` and `semver` versions, for repositories that version each action or workflow separately.
+
+        The prefix may use `{id}`, replaced by the identifier, and `{name}`, replaced by the name of the action directory or workflow file.
+        For example, `{name}/` selects tags like `setup-node/v1` and `setup-node/v1.4.2` for the action `actions/setup-node`.
+        """,
+    )
+
+    @field_validator("signature_tag_prefix")
+    @classmethod
+    def _validate_signature_tag_prefix(cls, value: str) -> str:
+        try:
+            value.format(id="", name="")
+        except (KeyError, IndexError, ValueError) as error:
+            raise ValueError(
+                f"'{value}' may only use the '{{id}}' and '{{name}}' placeholders ({error!r})"
+            ) from error
+        return value
+
     signature_prematter: str = Field(
         default="",
         description="Text to render before the signature code block.",
@@ -251,6 +283,109 @@ class GitHubConfig(BaseModel):
         """,
     )
 
+    cache: bool = Field(
+        default=False,
+        description="""Whether to cache the collected and rendered actions and workflows on disk between builds.
+
+        Entries are keyed by the file path and a hash of its content, so a file is only parsed again when it changes.
+        The cache is invalidated automatically when the handler is upgraded.
+        """,
+    )
+
+    cache_dir: str = Field(
+        default=".cache/mkdocstrings-github",
+        description="The directory of the on-disk cache, relative to the directory of the configuration file.",
+    )
+
+    cache_max_size: int = Field(
+        default=64 * 1024 * 1024,
+        description="The maximum size of the on-disk cache in bytes. The least recently used entries are evicted first.",
+    )
+
+    parse_mode: PARSE_MODE = Field(
+        default="roundtrip",
+        description="""The YAML loader used to collect actions and workflows.
+
+        - `roundtrip`: use the round-trip loader, which keeps comments to find `# group:` annotations,
+        - `fast`: use the C-based safe loader and find `# group:` annotations with a single scan of the source.
+            Falls back to the round-trip loader if the scan cannot attribute a group comment unambiguously.
+        - `stream`: like `fast`, but workflows are loaded from the parser's event stream and only the parts
+            that are documented are kept. Scripts of `run:` steps are truncated to their first line.
+        """,
+    )
+
+    collect_cache_size: int = Field(
+        default=256,
+        description="""The number of collected actions and workflows to keep in memory.
+
+        An identifier that is documented on several pages is only parsed once, as long as its file is unchanged.
+        Set to `0` to disable the in-memory cache.
+        """,
+    )
+
+    render_cache_size: int = Field(
+        default=256,
+        description="""The number of rendered actions and workflows to keep in memory.
+
+        An object rendered again with the same options, templates and versions reuses its HTML.
+        HTML with relative links is only reused on the same page. With [`cache`][mkdocstrings_handlers.github.config.GitHubConfig.cache],
+        rendered HTML is also kept on disk between builds. Set to `0` to disable the render cache.
+        """,
+    )
+
+    template_auto_reload: bool | None = Field(
+        default=None,
+        description="""Whether to check if templates changed on disk every time they are used.
+
+        By default, templates are only checked while serving the documentation, e.g. with `mkdocs serve`.
+        With [`cache`][mkdocstrings_handlers.github.config.GitHubConfig.cache], compiled templates are
+        also kept on disk between builds.
+        """,
+    )
+
+    template_variants: int = Field(
+        default=16,
+        description="""The number of option combinations to keep specialized templates for.
+
+        Templates are compiled for each combination of options they are rendered with,
+        with the options replaced by their values and the disabled sections removed.
+        Set to `0` to render every object with the same generic templates.
+        """,
+    )
+
+    markdown_cache_size: int = Field(
+        default=1024,
+        description="""The number of converted descriptions to keep in memory.
+
+        Descriptions with the same text, heading level and parent id are only converted from Markdown once,
+        for example shared inputs of several workflows. Set to `0` to convert every description.
+        """,
+    )
+
+    highlight_cache_size: int = Field(
+        default=128,
+        description="""The number of highlighted source files to keep in memory.
+
+        Source code shown with [`show_source`][mkdocstrings_handlers.github.config.GitHubOptions.show_source]
+        is only highlighted again when its content or the highlighting configuration changes.
+        With [`cache`][mkdocstrings_handlers.github.config.GitHubConfig.cache], highlighted code is also
+        kept on disk between builds. Set to `0` to disable the highlight cache.
+        """,
+    )
+
+    collect_workers: int = Field(
+        default=0,
+        description="""The number of processes used to parse actions and workflows collected in a batch.
+
+        Set to `0` to use one process per CPU, or to `1` to parse in the current process only.
+        """,
+    )
+
+    collect_parallel_threshold: int = Field(
+        default=8,
+        description="The minimum number of files to parse in a batch before worker processes are used.",
+    )
+
     options: GitHubOptions = Field(
         default_factory=GitHubOptions,
         description="Options for the GitHub handler.",
@@ -0,0 +1,126 @@
+"""Structured differences between two versions of an action or workflow."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import TYPE_CHECKING, Generic, Literal, TypeVar
+
+from mkdocstrings_handlers.github.objects import P, PermissionSet
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+    from mkdocstrings_handlers.github.objects import (
+        Action,
+        Input,
+        Output,
+        PermissionLevel,
+        Secret,
+        Workflow,
+    )
+
+T = TypeVar("T")
+
+_IGNORED_FIELDS = ("name", "group")
+"""Fields that do not change the interface of a parameter."""
+
+
+@dataclass(frozen=True, slots=True)
+class Change(Generic[T]):
+    """A parameter or permission that was added, removed or changed."""
+
+    name: str
+    old: T | None
+    new: T | None
+    fields: tuple[str, ...] = ()
+    """The names of the changed fields, for changed parameters."""
+
+    @property
+    def kind(self) -> Literal["added", "removed", "changed"]:
+        if self.old is None:
+            return "added"
+        if self.new is None:
+            return "removed"
+        return "changed"
+
+
+@dataclass(slots=True)
+class Diff:
+    """The changes of an action or workflow since a git ref."""
+
+    ref: str
+    inputs: list[Change[Input]] = field(default_factory=list)
+    outputs: list[Change[Output]] = field(default_factory=list)
+    secrets: list[Change[Secret]] = field(default_factory=list)
+    permissions: list[Change[PermissionLevel]] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return any(changes for _section, changes in self.sections())
+
+    def sections(self) -> Iterator[tuple[str, list[Change]]]:
+        """Yield the name and the changes of every section."""
+        yield "inputs", self.inputs
+        yield "outputs", self.outputs
+        yield "secrets", self.secrets
+        yield "permissions", self.permissions
+
+
+@lru_cache(maxsize=None)
+def _compared_fields(cls: type) -> tuple[str, ...]:
+    return tuple(f.name for f in fields(cls) if f.name not in _IGNORED_FIELDS)
+
+
+def diff_parameters(old: Sequence[P], new: Sequence[P]) -> list[Change[P]]:
+    """Match parameters by name and return the added, changed and removed ones.
+
+    Added and changed parameters are in the order of `new`, followed by the removed ones.
+    """
+    previous = {parameter.name: parameter for parameter in old}
+    changes: list[Change[P]] = []
+    for parameter in new:
+        name = parameter.name
+        before = previous.pop(name, None)
+        if before is None:
+            changes.append(Change(name, None, parameter))
+        elif before != parameter:
+            changed = tuple(
+                f
+                for f in _compared_fields(type(parameter))
+                if getattr(before, f) != getattr(parameter, f)
+            )
+            if changed:
+                changes.append(Change(name, before, parameter, changed))
+    changes.extend(Change(name, parameter, None) for name, parameter in previous.items())
+    return changes
+
+
+def diff_permissions(old: PermissionSet, new: PermissionSet) -> list[Change[PermissionLevel]]:
+    """Return the permission scopes that were added, removed or changed level."""
+    changes = [
+        Change(scope, old.get(scope), level)
+        for scope, level in new.items()
+        if old.get(scope) != level
+    ]
+    changes.extend(Change(scope, level, None) for scope, level in old.items() if scope not in new)
+    return changes
+
+
+def diff(old: Action | Workflow | None, new: Action | Workflow, ref: str) -> Diff:
+    """Compare an action or workflow with its version at a git ref.
+
+    Arguments:
+        old: The object at the ref, or `None` if it did not exist.
+        new: The current object.
+        ref: The git ref of the old object.
+    """
+    empty = PermissionSet()
+    return Diff(
+        ref=ref,
+        inputs=diff_parameters(old.inputs if old else [], new.inputs),
+        outputs=diff_parameters(old.outputs if old else [], new.outputs),
+        secrets=diff_parameters(getattr(old, "secrets", []), getattr(new, "secrets", [])),
+        permissions=diff_permissions(
+            getattr(old, "permissions", empty), getattr(new, "permissions", empty)
+        ),
+    )
@@ -2,12 +2,20 @@
 
 from __future__ import annotations
 
+import multiprocessing
 import os
 import re
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from dataclasses import replace
+from functools import cached_property
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, ClassVar, Mapping
+from urllib.parse import urlsplit
 
-import git
+from jinja2 import FileSystemBytecodeCache, TemplateError
+from markupsafe import Markup
 from mkdocs.exceptions import PluginError
 from mkdocstrings import (
     BaseHandler,
@@ -15,23 +23,92 @@ from mkdocstrings import (
     HandlerOptions,
     get_logger,
 )
-from packaging.version import InvalidVersion, Version
 
 from mkdocstrings_handlers.github import rendering
+from mkdocstrings_handlers.github.cache import (
+    DiskCache,
+    HighlightCache,
+    LRUCache,
+    RenderCache,
+    Rendered,
+    content_hash,
+    handler_version,
+    highlighter_fingerprint,
+    markdown_fingerprint,
+)
 from mkdocstrings_handlers.github.config import GitHubConfig, GitHubOptions
-from mkdocstrings_handlers.github.objects import Action, Workflow
+from mkdocstrings_handlers.github.diff import Diff, diff
+from mkdocstrings_handlers.github.index import (
+    ACTION_FILES,
+    WORKFLOW_SUFFIXES,
+    IdentifierIndex,
+    normalize_identifier,
+)
+from mkdocstrings_handlers.github.objects import (
+    FULL,
+    Action,
+    Projection,
+    Workflow,
+    may_be_reusable,
+    read_file,
+)
+from mkdocstrings_handlers.github.releases import DeprecatedTag, Releases, VersionSnapshot
+from mkdocstrings_handlers.github.repository import Blob, Repository
+from mkdocstrings_handlers.github.specialization import specialize
+from mkdocstrings_handlers.github.view import View, build_view
 
 if TYPE_CHECKING:
-    from collections.abc import MutableMapping
+    from collections.abc import Iterable, MutableMapping
 
+    from jinja2 import Environment
     from mkdocs.config.defaults import MkDocsConfig
+    from mkdocs_autorefs import AutorefsHookInterface
 
 
-SEMVER_PATTERN = re.compile(r"^v(\d+\.\d+\.\d+)$")
-MAJOR_PATTERN = re.compile(r"^v(\d+)$")
+_logger = get_logger(__name__)
 
+Signature = tuple[str, int, int]
+"""An identifier with the modification time and size of its file."""
 
-_logger = get_logger(__name__)
+_BATCH_SEPARATOR = f"<!-- gh-batch-{uuid.uuid4().hex} -->"
+"""An HTML comment separating texts converted in one Markdown pass, kept as is in the HTML."""
+
+_UNBATCHABLE_RE = re.compile(r"^ {0,3}(?:#|<|\[[^\]]*\]:)|\[\^|\*\[|\{", re.MULTILINE)
+"""Markdown that can affect other texts of the same pass: headings (and their unique ids),
+HTML blocks (including `md_in_html`), link and abbreviation definitions, footnotes,
+and anything that may be an `attr_list`, like `{#id}` or `{: .class }`."""
+
+
+def _serving(tool_config: MkDocsConfig) -> bool:
+    """Whether the documentation is being served, e.g. with `mkdocs serve`, and templates may change.
+
+    `mkdocs serve` points `site_url` to the address of its development server, `dev_addr`.
+    """
+    try:
+        host, port = tool_config["dev_addr"]
+        url = urlsplit(tool_config["site_url"] or "")
+        return (url.hostname, url.port) == (host.strip("[]"), port)
+    except (KeyError, TypeError, ValueError):
+        # Not an MkDocs configuration, e.g. from another static site generator.
+        return False
+
+
+def _release_source(data: Workflow | Action | None) -> None:
+    if data is not None:
+        data.release_source()
+
+
+def _projection(options: GitHubOptions | Mapping[str, Any]) -> Projection:
+    # mkdocstrings passes the options returned by `get_options`, collect everything for others.
+    return Projection.from_options(options) if isinstance(options, GitHubOptions) else FULL
+
+
+def _covers(data: Workflow | Action | None, projection: Projection) -> bool:
+    return data is None or data.projection.covers(projection)
+
+
+def _widen(data: Workflow | Action | None, projection: Projection) -> Projection:
+    return projection if data is None else data.projection | projection
 
 
 class GitHubHandler(BaseHandler):
@@ -52,7 +129,10 @@ class GitHubHandler(BaseHandler):
     def __init__(
         self,
         config: GitHubConfig,
-        repo: git.Repo,
+        repo: Repository,
+        base_dir: Path | None = None,
+        *,
+        serving: bool = False,
         **kwargs: Any,
     ) -> None:
         """
@@ -60,64 +140,67 @@ class GitHubHandler(BaseHandler):
 
         Args:
             config: The handler configuration.
+            repo: The git repository containing the actions and workflows.
             base_dir: The base directory of the project.
+            serving: Whether the documentation is being served, so templates may change.
             **kwargs: Arguments passed to the parent constructor.
         """
         super().__init__(**kwargs)
         self.config = config
         self.repo = repo
+        self.base_dir = base_dir or Path.cwd()
         self.global_options = config.options.__dict__
-        self.major: str = ""
-        self.semver: str = ""
-
-        if rendering.ENV_MAJOR_TAG not in os.environ or rendering.ENV_SEMVER_TAG not in os.environ:
-            self.get_releases()
+        self.releases = Releases(repo)
+        self.versions = VersionSnapshot(repo, self.releases)
+        self.collected: LRUCache[Signature, Workflow | Action | None] = LRUCache(
+            config.collect_cache_size, on_evict=_release_source
+        )
+        self.disk_cache: DiskCache | None = None
+        if config.cache:
+            self.disk_cache = DiskCache(self.base_dir / config.cache_dir, config.cache_max_size)
+            bytecode_dir = self.disk_cache.directory / "templates"
+            bytecode_dir.mkdir(exist_ok=True)
+            self.env.bytecode_cache = FileSystemBytecodeCache(str(bytecode_dir))
+        auto_reload = config.template_auto_reload
+        self.env.auto_reload = serving if auto_reload is None else auto_reload
+        self._preloaded = False
+        self.render_cache = RenderCache(config.render_cache_size, self.disk_cache)
+        self.views: LRUCache[tuple[str, str], View] = LRUCache(config.render_cache_size)
+        self.variants: LRUCache[str, Environment] = LRUCache(config.template_variants)
+        self.highlight_cache = HighlightCache(config.highlight_cache_size, self.disk_cache)
+        self._highlighter_fingerprint = ""
+        self.converted: LRUCache[tuple[str, int, str, bool, str], Rendered] = LRUCache(
+            config.markdown_cache_size
+        )
+        self.blobs: LRUCache[tuple[str, str], Workflow | Action | None] = LRUCache(
+            config.collect_cache_size, on_evict=_release_source
+        )
+        self.index = IdentifierIndex.from_repo(repo)
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def semver(self) -> str:
+        """The latest release tag matching `vX.Y.Z`, resolved on first access."""
+        return self.releases.semver
+
+    @semver.setter
+    def semver(self, value: str) -> None:
+        self.releases.semver = value
+
+    @property
+    def major(self) -> str:
+        """The latest release tag matching `vX`, resolved on first access."""
+        return self.releases.major
+
+    @major.setter
+    def major(self, value: str) -> None:
+        self.releases.major = value
 
     def get_releases(self) -> None:
-        # Get all tags from the local git repository.
-        try:
-            tags = [tag.name for tag in self.repo.tags]
-        except Exception as e:
-            _logger.warning(f"Could not get git tags from repository: {e}")
-            return
-
-        # Separate semver, major, and other tags
-        semver_tags = []
-        major_tags = []
-        other_tags = []
-        for tag in tags:
-            if SEMVER_PATTERN.match(tag):
-                semver_tags.append(tag)
-            elif MAJOR_PATTERN.match(tag):
-                major_tags.append(tag)
-            else:
-                other_tags.append(tag)
-
-        # Sort tags using packaging.version.Version
-        def version_key(tag):
-            try:
-                return Version(tag.lstrip("v"))
-            except InvalidVersion:
-                return Version("0.0.0")
-
-        semver_tags_sorted = sorted(semver_tags, key=version_key, reverse=True)
-        major_tags_sorted = sorted(major_tags, key=version_key, reverse=True)
-        other_tags_sorted = sorted(other_tags, reverse=True)
-
-        if semver_tags_sorted:
-            self.semver = semver_tags_sorted[0]
-            _logger.info(f"Using git tag '{self.semver}' for semver.")
-        else:
-            _logger.warning("No semver tags found in repository.")
-
-        if major_tags_sorted:
-            self.major = major_tags_sorted[0]
-            _logger.info(f"Using git tag '{self.major}' for major.")
-        else:
-            _logger.warning("No major tags found in repository.")
-
-        if other_tags_sorted:
-            _logger.debug(f"Other git tags found: {', '.join(other_tags_sorted)}")
+        """Resolve the latest release tags of the repository again."""
+        self.releases.repo = self.repo
+        self.releases.resolve()
+        self.versions = VersionSnapshot(self.repo, self.releases)
 
     def get_options(self, local_options: Mapping[str, Any]) -> HandlerOptions:
         """Get combined default, global and local options.
@@ -145,17 +228,14 @@ class GitHubHandler(BaseHandler):
             # Try each remote to find a valid GitHub owner/repo
             owner = None
             repo_name = None
-            for remote in self.repo.remotes:
-                for url in remote.urls:
-                    match = re.search(
-                        r"(?P<host>[\w\.-]+)[/:](?P<owner>[^/]+)/(?P<repo>[^/.]+?)(?:\.git)?$",
-                        url,
-                    )
-                    if match:
-                        owner = match.group("owner")
-                        repo_name = match.group("repo")
-                        break
-                if owner and repo_name:
+            for url in self.repo.remote_urls():
+                match = re.search(
+                    r"(?P<host>[\w\.-]+)[/:](?P<owner>[^/]+)/(?P<repo>[^/.]+?)(?:\.git)?$",
+                    url,
+                )
+                if match:
+                    owner = match.group("owner")
+                    repo_name = match.group("repo")
                     break
             if not (owner and repo_name):
                 raise PluginError(
@@ -176,33 +256,267 @@ class GitHubHandler(BaseHandler):
         self.env.filters["anchor_id"] = rendering.anchor_id
         self.env.filters["as_string"] = rendering.as_string
         self.env.filters["generate_mermaid_flowchart"] = rendering.generate_mermaid_flowchart
-        self.env.globals["semver_tag"] = self.semver  # ty: ignore[invalid-assignment]
-        self.env.globals["major_tag"] = self.major  # ty: ignore[invalid-assignment]
+        if (highlight := self.env.filters.get("highlight")) is not None:
+            # mkdocstrings installs a new highlighter for every page, with the same configuration.
+            fingerprint = highlighter_fingerprint(getattr(highlight, "__self__", highlight))
+            self.env.filters["highlight"] = self.highlight_cache.wrap(highlight, fingerprint)
+            self._highlighter_fingerprint = fingerprint
+        self.env.globals["releases"] = self.releases  # ty: ignore[invalid-assignment]
         self.env.globals["git_repo"] = self.repo  # ty: ignore[invalid-assignment]
+        self.env.globals["versions"] = self.versions  # ty: ignore[invalid-assignment]
+        # Deprecated, resolved only if an overridden template still uses them.
+        self.env.globals["semver_tag"] = DeprecatedTag(self.versions, "semver")  # ty: ignore[invalid-assignment]
+        self.env.globals["major_tag"] = DeprecatedTag(self.versions, "major")  # ty: ignore[invalid-assignment]
         self.env.globals["repository_name"] = self.get_repository_name()  # ty: ignore[invalid-assignment]
+        if not self._preloaded:
+            self._preloaded = True
+            self._preload_templates()
+
+    def _preload_templates(self) -> None:
+        """Compile the templates for the global options, or load them from the bytecode cache."""
+        options = self.get_options({})
+        environment = self._environment(options, content_hash(options.model_dump_json()))
+        for name in self.env.list_templates(filter_func=lambda name: name.endswith(".jinja")):
+            try:
+                environment.get_template(name)
+            except TemplateError as error:
+                _logger.debug(f"Could not preload template '{name}': {error}")
 
     def collect(self, identifier: str, options: GitHubOptions) -> Workflow | Action | None:
+        if (at := self._split_ref(identifier)) is not None:
+            return self._collect_at(*at, _projection(options))
+        cls, file = self._resolve(identifier)
+        return self._load(cls, file, identifier, _projection(options))
+
+    def collect_many(
+        self, identifiers: Iterable[str], options: GitHubOptions
+    ) -> dict[str, Workflow | Action | None]:
+        """Collect several identifiers at once, parsing their files in parallel.
+
+        Files are parsed in a pool of worker processes that is reused across calls.
+        Below [`collect_parallel_threshold`][mkdocstrings_handlers.github.config.GitHubConfig.collect_parallel_threshold]
+        files, they are parsed in the current process.
+
+        Arguments:
+            identifiers: The identifiers to collect.
+            options: The options to collect with.
+
+        Returns:
+            The collected objects, by identifier.
+        """
+        identifiers = list(dict.fromkeys(identifiers))
+        projection = _projection(options)
+        collected: dict[str, Workflow | Action | None] = {}
+        pending: dict[str, tuple[type[Workflow] | type[Action], Path, Signature, Projection]] = {}
+        for identifier in identifiers:
+            if (at := self._split_ref(identifier)) is not None:
+                collected[identifier] = self._collect_at(*at, projection)
+                continue
+            cls, file = self._resolve(identifier)
+            signature = self._signature(file, identifier)
+            data = self.collected.get(signature)
+            if signature in self.collected and _covers(data, projection):
+                collected[identifier] = data
+            else:
+                pending[identifier] = (cls, file, signature, _widen(data, projection))
+
+        if len(pending) < max(self.config.collect_parallel_threshold, 2) or self.workers <= 1:
+            for identifier, (cls, file, signature, needed) in pending.items():
+                collected[identifier] = self._parse(cls, file, identifier, needed)
+                self.collected.set(signature, collected[identifier])
+            return {identifier: collected[identifier] for identifier in identifiers}
+
+        futures = {}
+        mode = self.config.parse_mode
+        for identifier, (cls, file, _signature, needed) in pending.items():
+            source = read_file(file)
+            if cls is Workflow and not may_be_reusable(source):
+                # Not worth sending to a worker.
+                collected[identifier] = None
+                continue
+            key = self._disk_key(file, identifier, source)
+            if (data := self._cached(key)) is not None and _covers(data, needed):
+                collected[identifier] = data
+            else:
+                needed = _widen(data, needed)
+                futures[identifier] = (
+                    key,
+                    self.executor.submit(cls.from_source, source, file, identifier, mode, needed),
+                )
+        for identifier, (key, future) in futures.items():
+            collected[identifier] = self._store(key, future.result())
+        for identifier, (_cls, _file, signature, _needed) in pending.items():
+            self.collected.set(signature, collected[identifier])
+        _logger.debug(f"Parsed {len(futures)} files in {self.workers} processes.")
+        return {identifier: collected[identifier] for identifier in identifiers}
+
+    @property
+    def workers(self) -> int:
+        """The number of processes used to parse files in `collect_many`."""
+        return self.config.collect_workers or os.cpu_count() or 1
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """The pool of worker processes, created on first use.
+
+        Workers are spawned rather than forked, as forking a process with threads,
+        like the file watcher of `mkdocs serve`, can leave locks held in the children.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def teardown(self) -> None:
+        """Shut down the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def _resolve(self, identifier: str) -> tuple[type[Workflow] | type[Action], Path]:
+        """Return the class and the file of the object an identifier refers to."""
         working_tree_dir = self.repo.working_tree_dir
         if working_tree_dir is None:
             raise CollectionError("Repository working tree directory is not available.")
-        path = Path(working_tree_dir) / identifier
+        root = Path(working_tree_dir)
+
+        if (indexed := self.index.get(identifier)) is not None:
+            path = root / indexed
+            return (Action if path.name in ACTION_FILES else Workflow), path
 
+        # Untracked files are not in the index, look them up in the working tree.
+        path = root / identifier
         if path.suffix in (".yml", ".yaml"):
             if not path.is_file():
-                raise CollectionError(f"Identifier '{identifier}' is not a valid workflow file.")
-            data = Workflow.from_file(path, id=identifier)
-        elif not path.is_dir():
-            raise CollectionError(
-                f"Identifier '{identifier}' is not a valid workflow file or action directory."
-            )
-        elif (action_path := path / "action.yml").is_file():
-            data = Action.from_file(action_path, id=identifier)
-        elif (action_path := path / "action.yaml").is_file():
-            data = Action.from_file(action_path, id=identifier)
+                raise CollectionError(
+                    f"Identifier '{identifier}' is not a valid workflow file.{self._suggest(identifier)}"
+                )
+            return Workflow, path
+        if path.is_dir():
+            for action_path in (path / name for name in ACTION_FILES):
+                if action_path.is_file():
+                    return Action, action_path
+        raise CollectionError(
+            f"Identifier '{identifier}' is not a valid workflow file or action directory."
+            f"{self._suggest(identifier)}"
+        )
+
+    def _resolve_at(self, identifier: str, ref: str) -> tuple[type[Workflow] | type[Action], Blob]:
+        """Return the class and the blob of the object an identifier refers to at a git ref."""
+        path = normalize_identifier(identifier)
+        if path.endswith(WORKFLOW_SUFFIXES):
+            candidates = [(Workflow, path)]
         else:
+            candidates = [
+                (Action, name if path == "." else f"{path}/{name}") for name in ACTION_FILES
+            ]
+        try:
+            for cls, candidate in candidates:
+                if (blob := self.repo.blob(ref, candidate)) is not None:
+                    return cls, blob
+        except ValueError as error:
+            raise CollectionError(f"Could not collect '{identifier}@{ref}': {error}.") from error
+        raise CollectionError(
+            f"Identifier '{identifier}' is not a valid workflow file or action directory at '{ref}'."
+        )
+
+    def _split_ref(self, identifier: str) -> tuple[str, str] | None:
+        """Return the path and the ref of an identifier like `deploy@v2`, or `None` without a ref.
+
+        Tracked actions and workflows whose path contains `@` are collected from the working tree.
+        """
+        if "@" not in identifier or identifier in self.index:
+            return None
+        path, _, ref = identifier.rpartition("@")
+        return path, ref
+
+    def _collect_at(self, path: str, ref: str, projection: Projection) -> Workflow | Action | None:
+        """Collect the object at a path from the git object database at a ref, without a checkout.
+
+        Objects are cached by blob SHA, so a file that is unchanged across refs is parsed once.
+        """
+        cls, blob = self._resolve_at(path, ref)
+        key = (normalize_identifier(path), blob.sha)
+        data = self.blobs.get(key)
+        if key not in self.blobs or not _covers(data, projection):
+            data = self._parse(cls, blob, path, _widen(data, projection))
+            self.blobs.set(key, data)
+        # The object may have been parsed at another ref with the same blob,
+        # or with another spelling of its path, like `./deploy` for `deploy`.
+        return None if data is None else replace(data, file=blob, id=path)
+
+    def _suggest(self, identifier: str) -> str:
+        if suggestions := self.index.suggest(identifier):
+            return " Did you mean " + ", ".join(f"'{s}'" for s in suggestions) + "?"
+        return ""
+
+    def _signature(self, file: Path, identifier: str) -> Signature:
+        try:
+            stat = file.stat()
+        except FileNotFoundError as error:
+            # Tracked in the git index, but removed from the working tree.
             raise CollectionError(
                 f"Identifier '{identifier}' is not a valid workflow file or action directory."
-            )
+            ) from error
+        return (identifier, stat.st_mtime_ns, stat.st_size)
+
+    def _load(
+        self,
+        cls: type[Workflow] | type[Action],
+        file: Path,
+        identifier: str,
+        projection: Projection,
+    ) -> Workflow | Action | None:
+        """Parse a file, reusing a previously collected object if the file is unchanged.
+
+        An object that was collected with a narrower projection is collected again,
+        with the union of both projections.
+        """
+        signature = self._signature(file, identifier)
+        if signature in self.collected:
+            data = self.collected.get(signature)
+            if _covers(data, projection):
+                return data
+            projection = _widen(data, projection)
+
+        data = self._parse(cls, file, identifier, projection)
+        _logger.debug(f"Read {signature[2]} bytes for '{identifier}'.")
+        self.collected.set(signature, data)
+        return data
+
+    def _parse(
+        self,
+        cls: type[Workflow] | type[Action],
+        file: Path | Blob,
+        identifier: str,
+        projection: Projection,
+    ) -> Workflow | Action | None:
+        source = read_file(file)
+        key = self._disk_key(file, identifier, source)
+        if (data := self._cached(key)) is not None:
+            if _covers(data, projection):
+                _logger.debug(f"Using cached '{identifier}'.")
+                return data
+            projection = _widen(data, projection)
+        mode = self.config.parse_mode
+        return self._store(key, cls.from_source(source, file, identifier, mode, projection))
+
+    def _disk_key(self, file: Path | Blob, identifier: str, source: str) -> str | None:
+        if self.disk_cache is None:
+            return None
+        # Objects parsed in `stream` or `fast` mode may differ from round-trip ones.
+        mode = self.config.parse_mode
+        return self.disk_cache.key(os.fspath(file), identifier, mode, content_hash(source))
+
+    def _cached(self, key: str | None) -> Workflow | Action | None:
+        if key is None or self.disk_cache is None:
+            return None
+        return self.disk_cache.get(key)
+
+    def _store(self, key: str | None, data: Workflow | Action | None) -> Workflow | Action | None:
+        if key is not None and self.disk_cache is not None and data is not None:
+            self.disk_cache.set(key, data)
         return data
 
     def render(
@@ -218,10 +532,161 @@ class GitHubHandler(BaseHandler):
         Returns:
             The rendered template as HTML.
         """
-        template = self.env.get_template(data.template)
-        html = template.render(options=options, data=data, config=self.config)
+        components = self._render_components(data, options)
+        page = self._page()
+        if (rendered := self.render_cache.get(data.id, components, page)) is not None:
+            self._headings.extend(rendered.replay())
+            return rendered.html
+
+        diff = self._diff(data, options.diff_ref) if options.diff_ref else None
+
+        view_key = (components["data"], components["options"])
+        if (view := self.views.get(view_key)) is None:
+            view = build_view(data, options)
+            self.views.set(view_key, view)
+        for html_id, texts in view.descriptions().items():
+            self._convert_batch(texts, options.heading_level, html_id)
+        start = len(self._headings)
+        template = self._environment(options, components["options"]).get_template(data.template)
+        html = template.render(options=options, data=data, config=self.config, diff=diff, view=view)
+        rendered = Rendered(html, [deepcopy(heading) for heading in self._headings[start:]])
+        self.render_cache.set(components, page, rendered)
+        return html
+
+    def do_convert_markdown(
+        self,
+        text: str,
+        heading_level: int,
+        html_id: str = "",
+        *,
+        strip_paragraph: bool = False,
+        autoref_hook: AutorefsHookInterface | None = None,
+    ) -> Markup:
+        """Render Markdown text, reusing the HTML of identical text converted before.
+
+        The headings registered by a conversion are replayed when its HTML is reused.
+        HTML with relative links is only reused on the same page.
+        """
+        if autoref_hook is not None or self.converted.max_size <= 0:
+            return super().do_convert_markdown(
+                text,
+                heading_level,
+                html_id,
+                strip_paragraph=strip_paragraph,
+                autoref_hook=autoref_hook,
+            )
+        key = (text, heading_level, html_id, strip_paragraph)
+        page = self._page()
+        converted = self.converted.get((*key, "")) or self.converted.get((*key, page))
+        if converted is not None:
+            self._headings.extend(converted.replay())
+            return Markup(converted.html)
+
+        start = len(self._headings)
+        html = super().do_convert_markdown(
+            text, heading_level, html_id, strip_paragraph=strip_paragraph
+        )
+        converted = Rendered(str(html), [deepcopy(heading) for heading in self._headings[start:]])
+        self.converted.set((*key, page if converted.page_dependent else ""), converted)
         return html
 
+    def _environment(self, options: GitHubOptions, fingerprint: str) -> Environment:
+        """Return the environment compiling templates specialized for the given options."""
+        if self.variants.max_size <= 0:
+            return self.env
+        if (variant := self.variants.get(fingerprint)) is None:
+            variant = specialize(self.env, options)
+            self.variants.set(fingerprint, variant)
+        return variant
+
+    def _convert_batch(self, texts: Iterable[str], heading_level: int, html_id: str) -> None:
+        """Convert texts in a single Markdown pass, for `do_convert_markdown` to reuse their HTML.
+
+        Texts that were already converted, or that could affect the others, are left to
+        `do_convert_markdown`. If the HTML cannot be split back per text, nothing is stored.
+        """
+        page = self._page()
+        batch = [
+            text
+            for text in dict.fromkeys(texts)
+            if text
+            and not _UNBATCHABLE_RE.search(text)
+            and (text, heading_level, html_id, False, "") not in self.converted
+            and (text, heading_level, html_id, False, page) not in self.converted
+        ][: self.converted.max_size]
+        if len(batch) < 2:
+            return
+        start = len(self._headings)
+        html = super().do_convert_markdown(
+            f"\n\n{_BATCH_SEPARATOR}\n\n".join(batch), heading_level, html_id
+        )
+        parts = html.split(_BATCH_SEPARATOR)
+        if len(parts) != len(batch) or len(self._headings) != start:
+            del self._headings[start:]
+            _logger.debug(f"Could not split {len(batch)} descriptions converted together.")
+            return
+        for text, part in zip(batch, parts):
+            converted = Rendered(str(part).strip(), [])
+            self.converted.set(
+                (text, heading_level, html_id, False, page if converted.page_dependent else ""),
+                converted,
+            )
+
+    def _render_components(self, data: Workflow | Action, options: GitHubOptions) -> dict[str, str]:
+        """Return everything a rendered object depends on, for the render cache."""
+        # The object is keyed by its file and content, hashed once when it was parsed,
+        # so that rendering does not read the file again.
+        content = data.source_hash or content_hash(data.source)
+        components = {
+            "data": content_hash(repr((os.fspath(data.file), data.id, content))),
+            "options": content_hash(options.model_dump_json()),
+            "config": content_hash(self.config.model_dump_json(exclude={"options"})),
+            "handler": handler_version(),
+            "version": f"{data.ref}:{self.versions.version(options, data.id)}",
+            "repository": str(self.env.globals.get("repository_name", "")),
+            "templates": self._templates_hash,
+            "markdown": self._markdown_fingerprint,
+            "highlighter": self._highlighter_fingerprint,
+        }
+        if options.diff_ref:
+            # The diff is only computed on a miss. The commit of the ref identifies the compared object.
+            try:
+                components["diff"] = self.repo.rev_parse(options.diff_ref)
+            except ValueError:
+                components["diff"] = ""
+        return components
+
+    @cached_property
+    def _markdown_fingerprint(self) -> str:
+        return markdown_fingerprint(self.mdx, self.mdx_config)
+
+    @cached_property
+    def _templates_hash(self) -> str:
+        loader = self.env.loader
+        if loader is None:
+            return ""
+        sources = []
+        for name in sorted(loader.list_templates()):
+            source, _filename, _uptodate = loader.get_source(self.env, name)
+            sources.append(f"{name}\0{source}")
+        return content_hash("\0".join(sources))
+
+    def _page(self) -> str:
+        """Return the page being built, which relative links in the HTML depend on."""
+        if self._md is not None and "relpath" in self._md.treeprocessors:
+            file = getattr(self._md.treeprocessors["relpath"], "file", None)
+            return getattr(file, "src_uri", "")
+        return ""
+
+    def _diff(self, data: Workflow | Action, ref: str) -> Diff:
+        """Compare an object with its version at a git ref, collected from the git objects."""
+        try:
+            previous = self._collect_at(data.id, ref, FULL)
+        except CollectionError as error:
+            _logger.warning(f"Comparing '{data.id}' with nothing: {error}")
+            previous = None
+        return diff(previous, data, ref)
+
 
 def get_handler(
     handler_config: MutableMapping[str, Any],
@@ -242,11 +707,13 @@ def get_handler(
         root = Path.cwd()
     else:
         root = Path(tool_config.config_file_path).parent
-    repo = git.Repo(path=root, search_parent_directories=True)
+    repo = Repository.open(root)
     config = GitHubConfig(**handler_config)
 
     return GitHubHandler(
         config=config,
         repo=repo,
+        base_dir=root,
+        serving=_serving(tool_config),
         **kwargs,
     )
@@ -0,0 +1,87 @@
+"""Index of the actions and workflows tracked in a git repository."""
+
+from __future__ import annotations
+
+import difflib
+import posixpath
+from typing import TYPE_CHECKING
+
+from mkdocstrings import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from mkdocstrings_handlers.github.repository import Repository
+
+ACTION_FILES = ("action.yml", "action.yaml")
+"""Action metadata filenames, in order of precedence."""
+
+WORKFLOWS_DIR = ".github/workflows"
+WORKFLOW_SUFFIXES = (".yml", ".yaml")
+
+_logger = get_logger(__name__)
+
+
+def normalize_identifier(identifier: str) -> str:
+    """Return the canonical form of an identifier, e.g. `./actions/foo/` becomes `actions/foo`."""
+    return posixpath.normpath(identifier.replace("\\", "/"))
+
+
+class IdentifierIndex:
+    """A mapping of identifiers to the action or workflow files they refer to.
+
+    Actions are identified by the directory of their `action.yml` or `action.yaml` file,
+    with `.` for an action at the repository root. Workflows are identified by their path.
+    All paths are relative to the repository root and use forward slashes.
+    """
+
+    def __init__(self, paths: Iterable[str]) -> None:
+        """
+        Build the index from the paths of the files in a repository.
+
+        Args:
+            paths: The paths of all files, relative to the repository root.
+        """
+        self._files: dict[str, str] = {}
+        for path in paths:
+            directory, name = posixpath.split(path)
+            if name in ACTION_FILES:
+                identifier = directory or "."
+                # `action.yml` takes precedence over `action.yaml`, like on GitHub.
+                if identifier not in self._files or name == ACTION_FILES[0]:
+                    self._files[identifier] = path
+            elif directory == WORKFLOWS_DIR and name.endswith(WORKFLOW_SUFFIXES):
+                self._files[path] = path
+
+    @classmethod
+    def from_repo(cls, repo: Repository) -> IdentifierIndex:
+        """Build the index from the files staged in the git index of a repository.
+
+        Reading the git index avoids walking the working tree, so untracked and ignored
+        directories like `node_modules` cost nothing. An unreadable index gives an empty index.
+        """
+        try:
+            paths = repo.tracked_files()
+        except Exception as e:
+            _logger.warning(f"Could not read the git index of the repository: {e}")
+            paths = []
+        index = cls(paths)
+        _logger.debug(f"Indexed {len(index)} actions and workflows.")
+        return index
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def __contains__(self, identifier: str) -> bool:
+        return normalize_identifier(identifier) in self._files
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._files)
+
+    def get(self, identifier: str) -> str | None:
+        """Return the path of the file an identifier refers to, or `None` if it is not indexed."""
+        return self._files.get(normalize_identifier(identifier))
+
+    def suggest(self, identifier: str, n: int = 3) -> list[str]:
+        """Return the indexed identifiers closest to an unknown identifier."""
+        return difflib.get_close_matches(normalize_identifier(identifier), self._files, n=n)
@@ -1,15 +1,48 @@
+import mmap
+import os
 import re
+import sys
+from collections.abc import Iterator, Mapping
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import cached_property, lru_cache
 from os import PathLike
-from typing import Any, Literal
+from typing import Any, Callable, Literal, TypeVar
 
+from mkdocstrings import get_logger
 from ruamel.yaml import YAML
 from ruamel.yaml.comments import CommentedMap
 from ruamel.yaml.tokens import CommentToken
 
+from mkdocstrings_handlers.github.cache import content_hash
+from mkdocstrings_handlers.github.config import PARSE_MODE, GitHubOptions
+from mkdocstrings_handlers.github.repository import Blob
+from mkdocstrings_handlers.github.stream import (
+    ALL,
+    SKIP,
+    WILDCARD,
+    Spec,
+    UnsupportedStream,
+    load_partial,
+)
+
 GROUP_PATTERN = r"#\s*group:\s*(.+)$"
+MMAP_THRESHOLD = 1024 * 1024
+INTERN_MAX_LENGTH = 64
+RUN_PREVIEW_LENGTH = 80
 yaml = YAML()
+safe_yaml = YAML(typ="safe", pure=False)
+
+_logger = get_logger(__name__)
+
+_GROUP_RE = re.compile(GROUP_PATTERN)
+_KEY_LINE_RE = re.compile(
+    r"""(?P<indent>\ *)(?P<dashes>(?:-\ +)*)"""
+    r"""(?P<key>"[^"\\]*"|'[^']*'|[^\s#'"\[\]{},&*!|>%@`-][^#]*?|-\S[^#]*?)\s*:(?:\s+(?P<rest>.*))?"""
+)
+_BLOCK_SCALAR_RE = re.compile(r"[|>](?:[1-9][+-]?|[+-][1-9]?)?")
+_ON_KEY_RE = re.compile(r"""^(?:on|"on"|'on')[ \t]*:(?:[ \t]+(?P<value>[^\n]*))?$""", re.MULTILINE)
+_TOP_LEVEL_RE = re.compile(r"^[^\s#]", re.MULTILINE)
 
 
 def group_from_map(map: CommentedMap) -> str:
@@ -28,7 +61,215 @@ def group_from_map(map: CommentedMap) -> str:
     return ""
 
 
-@dataclass
+def _split_value(rest: str) -> tuple[str, str, bool]:
+    """Split the value of a key line from its trailing comment.
+
+    Returns the value, the comment and whether a quoted value is closed on this line.
+    """
+    if rest.startswith("#"):
+        return "", rest, True
+    end = 0
+    if rest[:1] in ("'", '"'):
+        quote = rest[0]
+        end = 1
+        while True:
+            end = rest.find(quote, end)
+            if end < 0:
+                return rest, "", False
+            if quote == "'" and rest[end + 1 : end + 2] == "'":
+                end += 2
+            elif quote == '"' and rest[end - 1] == "\\":
+                end += 1
+            else:
+                end += 1
+                break
+    comment = rest.find(" #", end)
+    if comment < 0:
+        return rest.rstrip(), "", True
+    return rest[:comment].rstrip(), rest[comment + 1 :], True
+
+
+def _flow_closed(value: str) -> bool:
+    """Whether a flow collection is closed on the same line, ignoring brackets in quotes."""
+    depth = 0
+    quote = ""
+    for char in value:
+        if quote:
+            if char == quote:
+                quote = ""
+        elif char in ("'", '"'):
+            quote = char
+        elif char in ("[", "{"):
+            depth += 1
+        elif char in ("]", "}"):
+            depth -= 1
+            if depth == 0:
+                return True
+    return False
+
+
+def scan_groups(source: str) -> dict[tuple[str, ...], str] | None:
+    """Find the `# group:` comments of mapping keys with a single pass over the source lines.
+
+    A group is attributed to a key when the comment is on the key line, or on its own line
+    between the key and its first child, matching what `group_from_map` finds after a
+    round-trip parse. Like there, when the key line has a comment, it is joined with the
+    comment lines that follow and only the last of them counts. Otherwise, the first
+    group comment on its own line counts.
+
+    Returns:
+        The groups by key path, or `None` if the source contains group comments or YAML
+        constructs that cannot be attributed reliably without a round-trip parse.
+    """
+    groups: dict[tuple[str, ...], str] = {}
+    stack: list[tuple[int, str]] = []
+    pending: tuple[str, ...] | None = None
+    # Whether the pending key line has a comment, which the following comment lines extend.
+    pending_inline = False
+    block_column = -1
+    quote = ""
+    started = False
+
+    for line in source.split("\n"):
+        stripped = line.strip()
+        if quote:
+            # Continuation of a multi-line quoted scalar.
+            _, comment, closed = _split_value(quote + stripped)
+            if closed:
+                quote = ""
+                if _GROUP_RE.search(comment):
+                    return None
+            continue
+        if block_column >= 0:
+            if not stripped or len(line) - len(line.lstrip(" ")) > block_column:
+                continue
+            block_column = -1
+        if not stripped:
+            continue
+        if stripped.startswith("#"):
+            match = _GROUP_RE.search(stripped)
+            if pending is not None and pending_inline:
+                if match:
+                    groups[pending] = match.group(1).strip()
+                else:
+                    groups.pop(pending, None)
+            elif match:
+                if pending is None:
+                    return None
+                groups.setdefault(pending, match.group(1).strip())
+            continue
+        if stripped.startswith("%"):
+            continue
+        if stripped == "---" or stripped.startswith("--- ") or stripped == "...":
+            if started:
+                return None
+            continue
+        if line[: len(line) - len(line.lstrip())].count("\t"):
+            return None
+
+        started = True
+        pending = None
+        match = _KEY_LINE_RE.fullmatch(line)
+        if match is None:
+            # A sequence item or the continuation of a plain multi-line scalar.
+            if _GROUP_RE.search(line):
+                return None
+            value = stripped.lstrip("- ")
+            if value[:1] in ("&", "*", "!"):
+                return None
+            if value[:1] in ("[", "{") and not _flow_closed(value):
+                return None
+            if value[:1] in ("'", '"') and not _split_value(value)[2]:
+                quote = value[0]
+            continue
+
+        column = len(match.group("indent"))
+        for dash in re.findall(r"-\ +", match.group("dashes")):
+            while stack and stack[-1][0] >= column:
+                stack.pop()
+            stack.append((column, "-"))
+            column += len(dash)
+        while stack and stack[-1][0] >= column:
+            stack.pop()
+
+        key = match.group("key")
+        if key[:1] in ("'", '"'):
+            key = key[1:-1]
+        if key == "<<":
+            return None
+        path = (*(parent for _, parent in stack), key)
+
+        value, comment, closed = _split_value(match.group("rest") or "")
+        group = _GROUP_RE.search(comment)
+        if not value:
+            if group:
+                groups[path] = group.group(1).strip()
+            stack.append((column, key))
+            pending = path
+            pending_inline = bool(comment)
+        elif group or value[:1] in ("&", "*", "!"):
+            return None
+        elif value[:1] in ("[", "{") and not _flow_closed(value):
+            return None
+        elif _BLOCK_SCALAR_RE.fullmatch(value):
+            block_column = column
+        elif not closed:
+            quote = value[0]
+
+    return groups
+
+
+def may_be_reusable(source: str) -> bool:
+    """Tell whether a workflow may be reusable, by scanning its top-level `on:` entry as text.
+
+    A `False` result is certain and the workflow does not need to be parsed.
+    A `True` result only means that the workflow has to be parsed to find out.
+    """
+    if "workflow_call" not in source:
+        return False
+    match = _ON_KEY_RE.search(source)
+    if match is None:
+        # No block-style `on:` key, e.g. a flow-style document.
+        return True
+    value = match.group("value") or ""
+    if value.startswith(("'", '"')) or (value.startswith(("[", "{")) and not _flow_closed(value)):
+        # The value may continue on the next lines, at any indentation.
+        return True
+    end = _TOP_LEVEL_RE.search(source, match.end())
+    block = source[match.start() : end.start() if end else len(source)]
+    return "workflow_call" in block or "*" in block
+
+
+def _load(
+    source: str, mode: PARSE_MODE, spec: Spec = ALL
+) -> tuple[Any, Callable[[tuple[str, ...], Any], str]]:
+    """Load YAML source, returning the data and a function that finds the group of a key.
+
+    In `stream` mode, only the parts of the document selected by `spec` are loaded.
+    """
+    if mode in ("fast", "stream"):
+        groups = scan_groups(source)
+        if groups is None:
+            _logger.debug("Group comments are ambiguous, falling back to round-trip parsing.")
+        elif mode == "stream" and spec is not ALL:
+            try:
+                return load_partial(source, spec), lambda path, value: groups.get(path, "")
+            except UnsupportedStream as error:
+                _logger.debug(f"Cannot stream ({error}), falling back to fast parsing.")
+                return safe_yaml.load(source), lambda path, value: groups.get(path, "")
+        else:
+            return safe_yaml.load(source), lambda path, value: groups.get(path, "")
+    return yaml.load(source), lambda path, value: group_from_map(value)
+
+
+def _run_preview(run: Any) -> Any:
+    """Keep the first line of a `run:` script, which is never rendered in full."""
+    if isinstance(run, str):
+        return run.split("\n", 1)[0][:RUN_PREVIEW_LENGTH]
+    return run
+
+
+@dataclass(frozen=True, slots=True)
 class Input:
     name: str
     description: str = ""
@@ -39,7 +280,7 @@ class Input:
     group: str = ""
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Output:
     name: str
     description: str = ""
@@ -47,7 +288,7 @@ class Output:
     group: str = ""
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Secret:
     name: str
     description: str = ""
@@ -55,7 +296,7 @@ class Secret:
     group: str = ""
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Step:
     """Represents a step within a job."""
 
@@ -64,7 +305,7 @@ class Step:
     run: str = ""  # For steps that run commands
 
 
-@dataclass
+@dataclass(slots=True)
 class Job:
     """Represents a job within a workflow."""
 
@@ -80,6 +321,24 @@ class Job:
         return f"job_{job_id_safe}"
 
 
+P = TypeVar("P", Input, Output, Secret)
+
+
+def _intern(value: Any) -> Any:
+    """Intern a short string, so that values repeated across files share one object."""
+    if isinstance(value, str) and len(value) <= INTERN_MAX_LENGTH:
+        return sys.intern(str(value))
+    return value
+
+
+def _parameter(cls: type[P], name: Any, value: dict, group: str) -> P:
+    return cls(
+        name=_intern(name),
+        **{str(key): _intern(item) for key, item in value.items()},
+        group=_intern(group),
+    )
+
+
 def _get_member(d: dict, key: str, error_message: str = "", default: Any = None) -> Any:
     if key not in d:
         if default is not None:
@@ -88,19 +347,94 @@ def _get_member(d: dict, key: str, error_message: str = "", default: Any = None)
     return d[key]
 
 
-def _read_file(file: PathLike) -> tuple[str, dict]:
-    with open(file, "r", encoding="utf-8") as f:
-        source = f.read()
-        f.seek(0)
-        data = yaml.load(f)
-    return source, data
+def read_file(file: PathLike, mmap_threshold: int = MMAP_THRESHOLD) -> str:
+    """Read the source of an action or workflow file.
+
+    The file is read and decoded exactly once. Files of at least `mmap_threshold` bytes
+    are decoded directly from a memory map instead of being copied into a buffer first.
+    Files at a git ref are read from the object database.
+    """
+    if isinstance(file, Blob):
+        source = file.read().decode("utf-8")
+    else:
+        with open(file, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if 0 < mmap_threshold <= size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    source = str(buffer, "utf-8")
+            else:
+                source = f.read().decode("utf-8")
+    if "\r" in source:
+        source = source.replace("\r\n", "\n").replace("\r", "\n")
+    return source
+
+
+class SourceFile:
+    """Gives an object access to the source of its file, loaded on first access."""
+
+    file: PathLike
+
+    @cached_property
+    def source(self) -> str:
+        """The source of the file."""
+        return read_file(self.file)
+
+    @property
+    def ref(self) -> str | None:
+        """The git ref the file was collected at, or `None` for the working tree."""
+        return self.file.ref if isinstance(self.file, Blob) else None
+
+    def release_source(self) -> None:
+        """Release the loaded source, it is read again from the file on next access."""
+        self.__dict__.pop("source", None)
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state.pop("source", None)
+        return state
+
+
+@dataclass(frozen=True)
+class Projection:
+    """The parts of an action or workflow to collect, all of them by default."""
+
+    jobs: bool = True
+    """The jobs and steps of a workflow, used by the workflow chart."""
+    permissions: bool = True
+    """The permissions of a workflow, merged from all its jobs."""
+    outputs: bool = True
+    secrets: bool = True
+
+    @staticmethod
+    def from_options(options: GitHubOptions) -> "Projection":
+        """Return the projection needed to render with the given options."""
+        # A diff compares all parameters and permissions.
+        diff = bool(options.diff_ref)
+        return Projection(
+            jobs=options.workflow_chart,
+            permissions=(options.show_signature and options.signature_show_permissions) or diff,
+            outputs=options.show_outputs or diff,
+            secrets=options.show_signature or options.show_secrets or diff,
+        )
+
+    def covers(self, other: "Projection") -> bool:
+        """Whether everything in `other` is part of this projection."""
+        return all(getattr(self, name) or not getattr(other, name) for name in _PROJECTION_FIELDS)
+
+    def __or__(self, other: "Projection") -> "Projection":
+        return Projection(
+            **{name: getattr(self, name) or getattr(other, name) for name in _PROJECTION_FIELDS}
+        )
+
+
+_PROJECTION_FIELDS = ("jobs", "permissions", "outputs", "secrets")
+FULL = Projection()
 
 
 @dataclass
-class Action:
+class Action(SourceFile):
     # https://docs.github.com/en/actions/reference/workflows-and-actions/metadata-syntax
     file: PathLike
-    source: str
     id: str
     name: str
     description: str
@@ -109,26 +443,44 @@ class Action:
     inputs: list[Input] = field(default_factory=list)
     outputs: list[Output] = field(default_factory=list)
     branding: dict = field(default_factory=dict)
+    projection: Projection = FULL
+    source_hash: str = field(default="", repr=False, compare=False)
+    """The hash of the source the object was parsed from, which identifies it in caches."""
     template: Literal["action.html.jinja"] = "action.html.jinja"
 
     @staticmethod
-    def from_file(file: PathLike, id: str) -> "Action":
-        source, data = _read_file(file)
+    def from_file(
+        file: PathLike, id: str, mode: PARSE_MODE = "roundtrip", projection: Projection = FULL
+    ) -> "Action":
+        return Action.from_source(read_file(file), file, id, mode, projection)
+
+    @staticmethod
+    def from_source(
+        source: str,
+        file: PathLike,
+        id: str,
+        mode: PARSE_MODE = "roundtrip",
+        projection: Projection = FULL,
+    ) -> "Action":
+        data, group_of = _load(source, mode)
 
         action = Action(
             file=file,
-            source=source,
             id=id,
             name=_get_member(data, "name", "Action must have a name"),
             description=_get_member(data, "description", "Action must have a description"),
             using=_get_member(data, "runs", "Action must have a 'runs' section").get("using", ""),
             author=_get_member(data, "author", default=""),
             branding=_get_member(data, "branding", default={}),
+            projection=projection,
+            source_hash=content_hash(source),
         )
         for key, value in data.get("inputs", {}).items():
-            action.inputs.append(Input(name=key, **value, group=group_from_map(value)))
-        for key, value in data.get("outputs", {}).items():
-            action.outputs.append(Output(name=key, **value, group=group_from_map(value)))
+            group = group_of(("inputs", str(key)), value)
+            action.inputs.append(_parameter(Input, key, value, group))
+        for key, value in data.get("outputs", {}).items() if projection.outputs else ():
+            group = group_of(("outputs", str(key)), value)
+            action.outputs.append(_parameter(Output, key, value, group))
         return action
 
 
@@ -166,10 +518,10 @@ class PermissionLevel(Enum):
 
     @staticmethod
     def from_label(label: str) -> "PermissionLevel":
-        for perm in PermissionLevel:
-            if perm.label == label:
-                return perm
-        raise ValueError(f"No Permission with label '{label}'")
+        try:
+            return _LEVELS_BY_LABEL[label]
+        except (KeyError, TypeError):
+            raise ValueError(f"No Permission with label '{label}'") from None
 
     def __gt__(self, other):
         if isinstance(other, PermissionLevel):
@@ -177,99 +529,267 @@ class PermissionLevel(Enum):
         return NotImplemented
 
 
+_LEVELS_BY_LABEL = {level.label: level for level in PermissionLevel}
+
+# Every scope takes three bits in a `PermissionSet`, set cumulatively for each level,
+# so that the highest of two levels is their bitwise or.
+_SCOPE_BITS = 3
+_SCOPE_MASK = 0b111
+_LEVEL_BITS = {
+    PermissionLevel.none: 0b001,
+    PermissionLevel.read: 0b011,
+    PermissionLevel.write: 0b111,
+}
+_LEVELS_BY_BITS = {bits: level for level, bits in _LEVEL_BITS.items()}
+
+# Scopes are numbered once per process, starting with the documented ones.
+# Unknown scopes are numbered when they are first seen.
+_SCOPES: list[str] = list(PERMISSION_SCOPES)
+_SCOPE_INDEX: dict[str, int] = {scope: index for index, scope in enumerate(_SCOPES)}
+
+
+def _scope_index(scope: str) -> int:
+    if (index := _SCOPE_INDEX.get(scope)) is None:
+        index = _SCOPE_INDEX[scope] = len(_SCOPES)
+        _SCOPES.append(sys.intern(str(scope)))
+    return index
+
+
+def _repeat(bits: int) -> int:
+    return sum(bits << (index * _SCOPE_BITS) for index in range(len(PERMISSION_SCOPES)))
+
+
+_KNOWN_MASK = _repeat(_SCOPE_MASK)
+_READ_ALL = _repeat(_LEVEL_BITS[PermissionLevel.read])
+_WRITE_ALL = _repeat(_LEVEL_BITS[PermissionLevel.write])
+
+
+class PermissionSet(Mapping[str, PermissionLevel]):
+    """Permission levels by scope, packed in a single integer.
+
+    Merging two sets keeps the highest level of every scope, and is a bitwise or.
+    Scopes are iterated in the order they were added.
+    """
+
+    __slots__ = ("bits", "scopes")
+
+    def __init__(self, levels: Mapping[str, PermissionLevel] | None = None) -> None:
+        """
+        Initialize the set.
+
+        Args:
+            levels: The permission levels by scope.
+        """
+        self.bits = 0
+        scopes = []
+        for scope, level in (levels or {}).items():
+            index = _scope_index(scope)
+            self.bits |= _LEVEL_BITS[level] << (index * _SCOPE_BITS)
+            scopes.append(_SCOPES[index])
+        self.scopes: tuple[str, ...] = tuple(scopes)
+
+    @staticmethod
+    def all(level: PermissionLevel) -> "PermissionSet":
+        """Return the set with all documented scopes at the given level."""
+        return PermissionSet(dict.fromkeys(PERMISSION_SCOPES, level))
+
+    @staticmethod
+    def parse(permissions: Any) -> "PermissionSet":
+        """Parse the `permissions` of a workflow or job, either `read-all`, `write-all` or a mapping."""
+        if isinstance(permissions, str):
+            if permissions == "read-all":
+                return PermissionSet.all(PermissionLevel.read)
+            if permissions == "write-all":
+                return PermissionSet.all(PermissionLevel.write)
+            raise ValueError(f"Unknown permission level '{permissions}'")
+        if isinstance(permissions, dict):
+            return PermissionSet(
+                {scope: PermissionLevel.from_label(label) for scope, label in permissions.items()}
+            )
+        raise ValueError("permissions must be a string or a dictionary")
+
+    @property
+    def read_all(self) -> bool:
+        """Whether all documented scopes are at the `read` level."""
+        return self.bits & _KNOWN_MASK == _READ_ALL
+
+    @property
+    def write_all(self) -> bool:
+        """Whether all documented scopes are at the `write` level."""
+        return self.bits & _KNOWN_MASK == _WRITE_ALL
+
+    def __getitem__(self, scope: str) -> PermissionLevel:
+        index = _SCOPE_INDEX.get(scope)
+        bits = 0 if index is None else self.bits >> (index * _SCOPE_BITS) & _SCOPE_MASK
+        if not bits:
+            raise KeyError(scope)
+        return _LEVELS_BY_BITS[bits]
+
+    def __contains__(self, scope: object) -> bool:
+        if not isinstance(scope, str) or (index := _SCOPE_INDEX.get(scope)) is None:
+            return False
+        return bool(self.bits >> (index * _SCOPE_BITS) & _SCOPE_MASK)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.scopes)
+
+    def __len__(self) -> int:
+        return len(self.scopes)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PermissionSet):
+            return self.bits == other.bits
+        return super().__eq__(other)
+
+    def __hash__(self) -> int:
+        return hash(self.bits)
+
+    def __or__(self, other: "PermissionSet") -> "PermissionSet":
+        """Return the highest level of every scope in either set."""
+        merged = PermissionSet()
+        merged.bits = self.bits | other.bits
+        merged.scopes = self.scopes + tuple(scope for scope in other.scopes if scope not in self)
+        return merged
+
+    def replace(self, other: "PermissionSet") -> "PermissionSet":
+        """Return this set with the levels of the scopes in `other` replaced."""
+        mask = 0
+        for scope in other.scopes:
+            mask |= _SCOPE_MASK << (_SCOPE_INDEX[scope] * _SCOPE_BITS)
+        replaced = PermissionSet()
+        replaced.bits = self.bits & ~mask | other.bits
+        replaced.scopes = self.scopes + tuple(scope for scope in other.scopes if scope not in self)
+        return replaced
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Unknown scopes are numbered per process, pickle the levels by scope instead.
+        return (PermissionSet, (dict(self.items()),))
+
+    def __repr__(self) -> str:
+        levels = ", ".join(f"{scope!r}: {level.label!r}" for scope, level in self.items())
+        return f"PermissionSet({{{levels}}})"
+
+
+@lru_cache(maxsize=None)
+def workflow_spec(projection: Projection) -> Spec:
+    """Return the parts of a workflow that are loaded in `stream` mode for a projection."""
+    job: dict[str, Spec] = {}
+    if projection.permissions:
+        job["permissions"] = ALL
+    if projection.jobs:
+        job.update(
+            name=ALL,
+            uses=ALL,
+            needs=ALL,
+            steps={"name": ALL, "uses": ALL, "run": _run_preview},
+        )
+    return {
+        "name": ALL,
+        "description": ALL,
+        "on": {"workflow_call": ALL},
+        "permissions": ALL if projection.permissions else SKIP,
+        "jobs": {WILDCARD: job} if job else SKIP,
+    }
+
+
 @dataclass
-class Workflow:
+class Workflow(SourceFile):
     # https://docs.github.com/en/actions/reference/workflows-and-actions/workflow-syntax
     file: PathLike
-    source: str
     id: str
     name: str
     description: str
-    permissions: dict[str, PermissionLevel] = field(default_factory=dict)
+    permissions: PermissionSet = field(default_factory=PermissionSet)
+    job_permissions: dict[str, PermissionSet] = field(default_factory=dict)
+    """The permissions declared by each job, merged into `permissions`."""
     inputs: list[Input] = field(default_factory=list)
     secrets: list[Secret] = field(default_factory=list)
     outputs: list[Output] = field(default_factory=list)
     jobs: dict[str, Job] = field(default_factory=dict)
+    projection: Projection = FULL
+    source_hash: str = field(default="", repr=False, compare=False)
+    """The hash of the source the object was parsed from, which identifies it in caches."""
     template: Literal["workflow.html.jinja"] = "workflow.html.jinja"
 
     @property
     def permission_read_all(self) -> bool:
-        return all(
-            scope in self.permissions and self.permissions[scope] == PermissionLevel.read
-            for scope in PERMISSION_SCOPES
-        )
+        return self.permissions.read_all
 
     @property
     def permission_write_all(self) -> bool:
-        return all(
-            scope in self.permissions and self.permissions[scope] == PermissionLevel.write
-            for scope in PERMISSION_SCOPES
-        )
+        return self.permissions.write_all
 
     @staticmethod
-    def from_file(file: PathLike, id: str) -> "Workflow | None":
-        source, data = _read_file(file)
+    def from_file(
+        file: PathLike, id: str, mode: PARSE_MODE = "roundtrip", projection: Projection = FULL
+    ) -> "Workflow | None":
+        return Workflow.from_source(read_file(file), file, id, mode, projection)
+
+    @staticmethod
+    def from_source(
+        source: str,
+        file: PathLike,
+        id: str,
+        mode: PARSE_MODE = "roundtrip",
+        projection: Projection = FULL,
+    ) -> "Workflow | None":
+        if not may_be_reusable(source):
+            return None
+        data, group_of = _load(source, mode, workflow_spec(projection))
 
         if "on" not in data or "workflow_call" not in data["on"]:
             return None
 
         workflow = Workflow(
             file=file,
-            source=source,
             id=id,
             name=_get_member(data, "name", "Workflow must have a name"),
             description=_get_member(data, "description", default=""),
+            projection=projection,
+            source_hash=content_hash(source),
         )
 
         call = data["on"]["workflow_call"]
         if call:
             for key, value in call.get("inputs", {}).items():
-                workflow.inputs.append(Input(name=key, **value, group=group_from_map(value)))
-            for key, value in call.get("outputs", {}).items():
-                workflow.outputs.append(Output(name=key, **value, group=group_from_map(value)))
-            for key, value in call.get("secrets", {}).items():
-                workflow.secrets.append(Secret(name=key, **value, group=group_from_map(value)))
-
-        def set_all_permissions(level: str):
-            if level == "read-all":
-                for key in PERMISSION_SCOPES:
-                    workflow.permissions[key] = PermissionLevel.read
-            elif level == "write-all":
-                for key in PERMISSION_SCOPES:
-                    workflow.permissions[key] = PermissionLevel.write
-            else:
-                raise ValueError(f"Unknown permission level '{level}'")
-
-        if isinstance(permissions := data.get("permissions", {}), str):
-            set_all_permissions(permissions)
-        elif isinstance(permissions, dict):
-            for key, label in permissions.items():
-                workflow.permissions[key] = PermissionLevel.from_label(label)
-        else:
-            raise ValueError("permissions must be a string or a dictionary")
-        for job_id, job_data in data.get("jobs", {}).items():
-            if isinstance(permissions := job_data.get("permissions", {}), str):
-                set_all_permissions(permissions)
-            elif isinstance(permissions, dict):
-                for key, label in job_data.get("permissions", {}).items():
-                    if key in workflow.permissions:
-                        permission = PermissionLevel.from_label(label)
-                        if permission > workflow.permissions[key]:
-                            workflow.permissions[key] = permission
-                    else:
-                        workflow.permissions[key] = PermissionLevel.from_label(label)
-            else:
-                raise ValueError("permissions must be a string or a dictionary")
+                group = group_of(("on", "workflow_call", "inputs", str(key)), value)
+                workflow.inputs.append(_parameter(Input, key, value, group))
+            for key, value in call.get("outputs", {}).items() if projection.outputs else ():
+                group = group_of(("on", "workflow_call", "outputs", str(key)), value)
+                workflow.outputs.append(_parameter(Output, key, value, group))
+            for key, value in call.get("secrets", {}).items() if projection.secrets else ():
+                group = group_of(("on", "workflow_call", "secrets", str(key)), value)
+                workflow.secrets.append(_parameter(Secret, key, value, group))
+
+        if projection.permissions:
+            workflow.permissions = PermissionSet.parse(data.get("permissions", {}))
+        jobs = data.get("jobs", {}) if projection.jobs or projection.permissions else {}
+        for job_id, job_data in jobs.items():
+            if projection.permissions and "permissions" in job_data:
+                permissions = PermissionSet.parse(job_data["permissions"])
+                workflow.job_permissions[_intern(job_id)] = permissions
+                if isinstance(job_data["permissions"], str):
+                    # `read-all` and `write-all` set the level of every scope.
+                    workflow.permissions = workflow.permissions.replace(permissions)
+                else:
+                    workflow.permissions |= permissions
+
+            if not projection.jobs:
+                continue
 
             # Parse job information for flowchart
-            job = Job(id=job_id, name=job_data.get("name", job_id), uses=job_data.get("uses", None))
+            job = Job(
+                id=_intern(job_id),
+                name=_intern(job_data.get("name", job_id)),
+                uses=_intern(job_data.get("uses", None)),
+            )
 
             # Parse job dependencies
             needs = job_data.get("needs", [])
             if isinstance(needs, str):
-                job.needs = [needs]
+                job.needs = [_intern(needs)]
             elif isinstance(needs, list):
-                job.needs = needs
+                job.needs = [_intern(need) for need in needs]
 
             # Parse steps
             for step_data in job_data.get("steps", []):
@@ -278,8 +798,8 @@ class Workflow:
                 step_run = step_data.get("run", "")
 
                 step = Step(
-                    name=step_name,
-                    uses=step_uses,
+                    name=_intern(step_name),
+                    uses=_intern(step_uses),
                     run=step_run,
                 )
                 job.steps.append(step)
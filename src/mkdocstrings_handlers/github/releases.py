@@ -0,0 +1,356 @@
+"""Resolution of the latest release tags of a repository."""
+
+from __future__ import annotations
+
+import os
+import posixpath
+import re
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+from mkdocstrings import get_logger
+
+from mkdocstrings_handlers.github.index import WORKFLOWS_DIR, normalize_identifier
+from mkdocstrings_handlers.github.repository import Repository
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from mkdocstrings_handlers.github.config import GitHubOptions
+
+ENV_MAJOR_TAG = "MKDOCSTRINGS_GITHUB_MAJOR_TAG"
+ENV_SEMVER_TAG = "MKDOCSTRINGS_GITHUB_SEMVER_TAG"
+ENV_REFS = ("GITHUB_HEAD_REF", "GITHUB_REF_NAME")
+"""Variables set by GitHub Actions with the ref being built, in order of precedence.
+
+`GITHUB_HEAD_REF` is the source branch of a pull request, `GITHUB_REF_NAME` the branch or tag.
+"""
+
+RELEASE_PATTERN = re.compile(
+    r"^(?P<prefix>.*?)v(?P<major>\d+)(?:\.(?P<minor>\d+)\.(?P<patch>\d+))?$"
+)
+"""Release tags `vX` and `vX.Y.Z`, with an optional prefix like `setup-node/`."""
+
+_logger = get_logger(__name__)
+
+Stamp = tuple[tuple[str, int], ...]
+"""Modification times of the files and directories that store the tags of a repository."""
+
+_cache: dict[Path, tuple[Stamp, list[str]]] = {}
+
+
+def _stamp(git_dir: Path) -> Stamp:
+    stamp = []
+    packed_refs = git_dir / "packed-refs"
+    if packed_refs.is_file():
+        stamp.append((str(packed_refs), packed_refs.stat().st_mtime_ns))
+    # Adding or removing a loose tag renames a file into its directory, which updates its mtime.
+    for directory, _dirnames, _filenames in os.walk(git_dir / "refs" / "tags"):
+        stamp.append((directory, os.stat(directory).st_mtime_ns))
+    return tuple(stamp)
+
+
+def read_tags(git_dir: Path) -> list[str]:
+    """Return the names of the tags of a repository, read from its `packed-refs` and `refs/tags`.
+
+    The result is cached until one of these files or directories is modified.
+    """
+    stamp = _stamp(git_dir)
+    if (cached := _cache.get(git_dir)) is not None and cached[0] == stamp:
+        return cached[1]
+
+    tags = set()
+    packed_refs = git_dir / "packed-refs"
+    if packed_refs.is_file():
+        with open(packed_refs, encoding="utf-8") as f:
+            for line in f:
+                # Lines are `<sha> <ref>`, or `^<sha>` for the commit of the previous annotated tag.
+                _, _, ref = line.rstrip("\n").partition(" ")
+                if ref.startswith("refs/tags/"):
+                    tags.add(ref[len("refs/tags/") :])
+    tags_dir = git_dir / "refs" / "tags"
+    for directory, _dirnames, filenames in os.walk(tags_dir):
+        prefix = Path(directory).relative_to(tags_dir).as_posix()
+        for filename in filenames:
+            tags.add(filename if prefix == "." else f"{prefix}/{filename}")
+
+    result = list(tags)
+    _cache[git_dir] = (stamp, result)
+    return result
+
+
+def index_releases(tags: Iterable[str]) -> dict[str, tuple[str, str]]:
+    """Return the latest `vX.Y.Z` and `vX` tags of every tag prefix, in a single pass over the tags.
+
+    The prefix is the part of a tag before its version, e.g. `setup-node/` for `setup-node/v1.4.2`,
+    or an empty string for the releases of the whole repository.
+
+    Returns:
+        A mapping of prefixes to their latest semver and major tags, or empty strings if there are none.
+    """
+    # Per prefix: the latest semver tag and its key, then the latest major tag and its number.
+    latest: dict[str, list[Any]] = {}
+    for tag in tags:
+        if (match := RELEASE_PATTERN.match(tag)) is None:
+            continue
+        prefix, major, minor, patch = match.groups()
+        entry = latest.setdefault(prefix, ["", (-1,), "", -1])
+        if minor is None:
+            if (number := int(major)) > entry[3]:
+                entry[2:] = tag, number
+        elif (key := (int(major), int(minor), int(patch))) > entry[1]:
+            entry[:2] = tag, key
+    return {prefix: (entry[0], entry[2]) for prefix, entry in latest.items()}
+
+
+def latest_releases(tags: Iterable[str]) -> tuple[str, str]:
+    """Return the latest `vX.Y.Z` and `vX` tags without a prefix.
+
+    Returns:
+        The latest semver tag and the latest major tag, or empty strings if there are none.
+    """
+    return index_releases(tags).get("", ("", ""))
+
+
+class Releases:
+    """The latest release tags of a repository, resolved on first access.
+
+    The tags of all prefixes are indexed at once, so the releases of any prefix are a lookup.
+    """
+
+    def __init__(self, repo: Repository) -> None:
+        """
+        Initialize the releases of a repository.
+
+        Args:
+            repo: The git repository.
+        """
+        self.repo = repo
+        self._semver: str | None = None
+        self._major: str | None = None
+        self._index: dict[str, tuple[str, str]] | None = None
+
+    @property
+    def semver(self) -> str:
+        """The latest tag matching `vX.Y.Z`."""
+        if self._semver is None:
+            self.resolve()
+        return self._semver or ""
+
+    @semver.setter
+    def semver(self, value: str) -> None:
+        self._semver = value
+
+    @property
+    def major(self) -> str:
+        """The latest tag matching `vX`."""
+        if self._major is None:
+            self.resolve()
+        return self._major or ""
+
+    @major.setter
+    def major(self, value: str) -> None:
+        self._major = value
+
+    def latest(self, prefix: str) -> tuple[str, str]:
+        """Return the latest semver and major tags with the given prefix, e.g. `setup-node/`."""
+        if not prefix:
+            return self.semver, self.major
+        if self._index is None:
+            self.resolve()
+        return (self._index or {}).get(prefix, ("", ""))
+
+    def tags(self) -> list[str]:
+        """Return the names of all tags of the repository."""
+        if isinstance(self.repo, Repository) and self.repo.reftable:
+            return [tag.name for tag in self.repo.git.tags]
+        common_dir = getattr(self.repo, "common_dir", None)
+        if isinstance(common_dir, (str, os.PathLike)):
+            try:
+                return read_tags(Path(common_dir))
+            except OSError as e:
+                _logger.debug(f"Could not read git tags from '{common_dir}': {e}")
+        return [tag.name for tag in self.repo.tags]
+
+    def resolve(self) -> None:
+        """Find the latest release tags of the repository."""
+        try:
+            tags = self.tags()
+        except Exception as e:
+            _logger.warning(f"Could not get git tags from repository: {e}")
+            self._index = {}
+            self._semver = self._semver or ""
+            self._major = self._major or ""
+            return
+
+        self._index = index_releases(tags)
+        semver, major = self._index.get("", ("", ""))
+        if semver:
+            self._semver = semver
+            _logger.info(f"Using git tag '{semver}' for semver.")
+        else:
+            self._semver = self._semver or ""
+            _logger.warning("No semver tags found in repository.")
+        if major:
+            self._major = major
+            _logger.info(f"Using git tag '{major}' for major.")
+        else:
+            self._major = self._major or ""
+            _logger.warning("No major tags found in repository.")
+
+
+class VersionSnapshot:
+    """The versions a signature can refer to, resolved at most once per build.
+
+    The environment is read when the snapshot is created, and each version is resolved
+    on first access, so that tags are only read if a `major` or `semver` signature is rendered.
+    """
+
+    def __init__(
+        self,
+        repo: Repository | None,
+        releases: Releases | None,
+        environ: Mapping[str, str] = os.environ,
+    ) -> None:
+        """
+        Initialize the snapshot.
+
+        Args:
+            repo: The git repository, used to resolve the `ref` version.
+            releases: The release tags, used to resolve the `major` and `semver` versions.
+            environ: The environment variables.
+        """
+        self._repo = repo
+        self._releases = releases
+        self._env_ref = next((value for name in ENV_REFS if (value := environ.get(name))), None)
+        self._env_major = environ.get(ENV_MAJOR_TAG)
+        self._env_semver = environ.get(ENV_SEMVER_TAG)
+        self._prefixed: dict[tuple[str, str], tuple[str, str]] = {}
+
+    @cached_property
+    def ref(self) -> str:
+        """The ref being built: the CI ref, the branch, a tag or the short SHA of a detached HEAD."""
+        if self._env_ref:
+            return self._env_ref
+        if self._repo is None:
+            return "unknown"
+        try:
+            if branch := self._repo.branch:
+                return branch
+            if (sha := self._repo.head_commit) is None:
+                return "unknown"
+            tags = self._repo.tags_at(sha)
+        except Exception as e:
+            _logger.debug(f"Could not resolve the git ref of the repository: {e}")
+            return "unknown"
+        # Prefer the most specific release tag, e.g. `v1.2.3` over `v1`.
+        semver, major = latest_releases(tags)
+        return semver or major or (tags[0] if tags else sha[:7])
+
+    @cached_property
+    def major(self) -> str:
+        """The latest major release tag, unless overridden by the environment."""
+        if self._env_major is not None or self._releases is None:
+            return self._env_major or ""
+        return self._releases.major
+
+    @cached_property
+    def semver(self) -> str:
+        """The latest semver release tag, unless overridden by the environment."""
+        if self._env_semver is not None or self._releases is None:
+            return self._env_semver or ""
+        return self._releases.semver
+
+    def version(self, options: GitHubOptions, identifier: str = ".") -> str:
+        """Return the version selected by the `signature_version` option for an identifier."""
+        match options.signature_version:
+            case "ref":
+                return self.ref
+            case "major" | "semver" if options.signature_tag_prefix:
+                semver, major = self.releases(options.signature_tag_prefix, identifier)
+                return major if options.signature_version == "major" else semver
+            case "major":
+                return self.major
+            case "semver":
+                return self.semver
+        return options.signature_version_string
+
+    def releases(self, template: str, identifier: str) -> tuple[str, str]:
+        """Return the latest semver and major tags of an identifier, with a prefix built from a template.
+
+        The environment variables only override the releases of the whole repository.
+        """
+        key = (template, identifier)
+        if (cached := self._prefixed.get(key)) is None:
+            # `./actions/setup-node` and `actions/setup-node/` select the same tags.
+            identifier = normalize_identifier(identifier)
+            name = posixpath.basename(identifier)
+            if identifier.startswith(f"{WORKFLOWS_DIR}/"):
+                name = posixpath.splitext(name)[0]
+            prefix = template.format(id=identifier, name=name)
+            cached = self._prefixed[key] = (
+                self._releases.latest(prefix) if self._releases else ("", "")
+            )
+        return cached
+
+
+class DeprecatedTag:
+    """The `semver_tag` or `major_tag` template global, resolved from the versions on first use.
+
+    These globals were release tags. They are kept for templates overridden by users,
+    and behave like the tag string. Templates should use `versions.semver` and `versions.major`.
+    """
+
+    def __init__(self, versions: VersionSnapshot, name: Literal["semver", "major"]) -> None:
+        """
+        Initialize the tag.
+
+        Args:
+            versions: The versions to resolve the tag from.
+            name: The version to resolve, `semver` or `major`.
+        """
+        self._versions = versions
+        self._name = name
+
+    @cached_property
+    def value(self) -> str:
+        """The tag, whose resolution logs the deprecation."""
+        _log_deprecated_tag(self._name)
+        return getattr(self._versions, self._name)
+
+    def __str__(self) -> str:
+        return self.value
+
+    def __repr__(self) -> str:
+        return repr(self.value)
+
+    def __eq__(self, other: object) -> bool:
+        return self.value == (other.value if isinstance(other, DeprecatedTag) else other)
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+    def __bool__(self) -> bool:
+        return bool(self.value)
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def __add__(self, other: str) -> str:
+        return self.value + other
+
+    def __radd__(self, other: str) -> str:
+        return other + self.value
+
+    def __getattr__(self, name: str) -> Any:
+        # String methods, like `startswith` or `split`.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.value, name)
+
+
+@lru_cache(maxsize=None)
+def _log_deprecated_tag(name: str) -> None:
+    # Logged once per build process, not once per page.
+    _logger.info(f"The '{name}_tag' template global is deprecated, use 'versions.{name}' instead.")
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import os
 import textwrap
 from collections import OrderedDict
 from typing import TYPE_CHECKING, Sequence
@@ -11,34 +10,19 @@ from mkdocstrings_handlers.github.config import PARAMETERS_ORDER, STEP_DIRECTION
 from mkdocstrings_handlers.github.objects import Input, Output, Secret, Workflow
 
 if TYPE_CHECKING:
-    from git import Repo
     from jinja2.runtime import Context
 
 
-ENV_MAJOR_TAG = "MKDOCSTRINGS_GITHUB_MAJOR_TAG"
-ENV_SEMVER_TAG = "MKDOCSTRINGS_GITHUB_SEMVER_TAG"
-
-
 @pass_context
-def format_action_signature(context: Context, id: str, repo: str, options: GitHubOptions) -> str:
+def format_action_signature(
+    context: Context, id: str, repo: str, options: GitHubOptions, ref: str | None = None
+) -> str:
     name = repo if id == "." else f"{repo}/{id}"
-    match options.signature_version:
-        case "ref":
-            try:
-                git_repo = context.environment.globals["git_repo"]
-                if isinstance(git_repo, Repo):
-                    version = git_repo.head.ref.name
-                else:
-                    version = "unknown"
-            except Exception:
-                version = "unknown"
-        case "major":
-            version = os.environ.get(ENV_MAJOR_TAG, context.environment.globals["major_tag"])
-        case "semver":
-            version = os.environ.get(ENV_SEMVER_TAG, context.environment.globals["semver_tag"])
-        case "string":
-            version = options.signature_version_string
-
+    if ref is not None and options.signature_version == "ref":
+        # Collected at a git ref, e.g. `deploy@v2`.
+        version = ref
+    else:
+        version = context.environment.globals["versions"].version(options, id)
     return f"{name}@{version}"
 
 
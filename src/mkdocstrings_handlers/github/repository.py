@@ -0,0 +1,504 @@
+"""Read-only access to the git metadata the handler needs, without spawning git processes."""
+
+from __future__ import annotations
+
+import os
+import re
+import struct
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from mkdocstrings import get_logger
+
+if TYPE_CHECKING:
+    import git
+    import gitdb
+
+_logger = get_logger(__name__)
+
+_SECTION_RE = re.compile(r'^\[\s*([\w.-]+)(?:\s+"((?:[^"\\]|\\.)*)")?\s*\]')
+_GITLINK_MODE = 0o160000
+_TREE_MODE = 0o40000
+_HEX_RE = re.compile(r"[0-9a-f]{4,40}")
+
+
+class UnsupportedRepository(Exception):
+    """The repository uses a format that is not supported by the built-in reader."""
+
+
+def parse_config(text: str) -> list[tuple[str, str, str]]:
+    """Parse a git config file into `(section, key, value)` entries, in file order.
+
+    Sections with a subsection are named `section.subsection`, e.g. `remote.origin`.
+    Section and key names are lower-cased, like git does.
+    """
+    entries = []
+    section = ""
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if match := _SECTION_RE.match(line):
+            name, subsection = match.groups()
+            if subsection is None and "." in name:
+                # Deprecated `[section.subsection]` syntax.
+                name, _, subsection = name.partition(".")
+            section = name.lower() if subsection is None else f"{name.lower()}.{subsection}"
+            line = line[match.end() :].strip()
+        if not line or line[0] in "#;":
+            continue
+        key, _, value = line.partition("=")
+        entries.append((section, key.strip().lower(), _config_value(value)))
+    return entries
+
+
+def _config_value(value: str) -> str:
+    result = []
+    quoted = False
+    escaped = False
+    for char in value.strip():
+        if escaped:
+            result.append({"n": "\n", "t": "\t", "b": "\b"}.get(char, char))
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == '"':
+            quoted = not quoted
+        elif char in "#;" and not quoted:
+            break
+        else:
+            result.append(char)
+    return "".join(result).strip()
+
+
+def read_index(path: Path, hash_size: int = 20) -> list[str]:
+    """Return the paths of the entries of a git index file (versions 2 to 4).
+
+    Split indexes are merged with the shared index they link to, stored next to them.
+
+    Raises:
+        UnsupportedRepository: If the index is of an unknown version, or its shared index is missing.
+    """
+    entries, link = _read_entries(path.read_bytes(), hash_size)
+    if link is not None:
+        entries = _merge_shared_index(path, entries, link, hash_size)
+    return [
+        name.decode("utf-8", "surrogateescape") for mode, name in entries if mode != _GITLINK_MODE
+    ]
+
+
+def _read_entries(data: bytes, hash_size: int) -> tuple[list[tuple[int, bytes]], bytes | None]:
+    """Return the mode and path of the entries of an index, and its `link` extension if split."""
+    signature, version, count = struct.unpack_from(">4sII", data)
+    if signature != b"DIRC" or version not in (2, 3, 4):
+        raise UnsupportedRepository(f"unsupported index version {version}")
+
+    entries = []
+    offset = 12
+    previous = b""
+    # Ten 32-bit stat fields, the object hash, and 16 bits of flags.
+    fixed = 40 + hash_size + 2
+    for _ in range(count):
+        start = offset
+        (mode,) = struct.unpack_from(">I", data, offset + 24)
+        (flags,) = struct.unpack_from(">H", data, offset + fixed - 2)
+        offset += fixed
+        if version >= 3 and flags & 0x4000:
+            offset += 2
+        if version == 4:
+            strip, offset = _varint(data, offset)
+            end = data.index(b"\0", offset)
+            name = previous[: len(previous) - strip] + data[offset:end]
+            offset = end + 1
+        else:
+            end = data.index(b"\0", offset)
+            name = data[offset:end]
+            # Entries are padded with 1 to 8 NUL bytes to a multiple of 8 bytes.
+            offset = start + (end - start + 8) // 8 * 8
+        previous = name
+        entries.append((mode, name))
+
+    # Extensions follow the entries, up to the trailing checksum.
+    link = None
+    while offset + 8 <= len(data) - hash_size:
+        extension, size = struct.unpack_from(">4sI", data, offset)
+        if extension == b"link":
+            link = data[offset + 8 : offset + 8 + size]
+        offset += 8 + size
+    return entries, link
+
+
+def _merge_shared_index(
+    path: Path, entries: list[tuple[int, bytes]], link: bytes, hash_size: int
+) -> list[tuple[int, bytes]]:
+    """Apply the entries of a split index to the entries of its shared index.
+
+    The `link` extension holds the hash of the shared index, then a bitmap of the shared
+    entries that were deleted, and one of those replaced by the first entries of the split
+    index. Replacing entries have an empty path, the other entries are additions.
+    """
+    shared_hash = link[:hash_size]
+    if not shared_hash.strip(b"\0"):
+        return entries
+    shared_path = path.parent / f"sharedindex.{shared_hash.hex()}"
+    try:
+        shared, _link = _read_entries(shared_path.read_bytes(), hash_size)
+    except FileNotFoundError as error:
+        raise UnsupportedRepository(f"missing shared index '{shared_path.name}'") from error
+    deleted: set[int] = set()
+    replaced: set[int] = set()
+    if len(link) > hash_size:
+        deleted, offset = _ewah_bits(link, hash_size)
+        replaced, _offset = _ewah_bits(link, offset)
+
+    replacements = iter(entries)
+    merged = []
+    for position, (mode, name) in enumerate(shared):
+        if position in replaced:
+            mode, _name = next(replacements)
+        if position not in deleted:
+            merged.append((mode, name))
+    merged.extend(replacements)
+    # Sorting is stable, so the stages of a conflicted path stay in order.
+    merged.sort(key=lambda entry: entry[1])
+    return merged
+
+
+def _ewah_bits(data: bytes, offset: int) -> tuple[set[int], int]:
+    """Return the positions of the bits set in an EWAH compressed bitmap, and the offset after it.
+
+    The bitmap is a sequence of 64-bit words: each marker word gives a run of identical
+    words, whose bit is its lowest bit, then the number of literal words that follow it.
+    """
+    _size, count = struct.unpack_from(">II", data, offset)
+    words = struct.unpack_from(f">{count}Q", data, offset + 8)
+    bits: set[int] = set()
+    position = index = 0
+    while index < count:
+        marker = words[index]
+        running = (marker >> 1) & 0xFFFFFFFF
+        if marker & 1:
+            bits.update(range(position, position + running * 64))
+        position += running * 64
+        literals = marker >> 33
+        for word in words[index + 1 : index + 1 + literals]:
+            bits.update(position + bit for bit in range(64) if word >> bit & 1)
+            position += 64
+        index += 1 + literals
+    # The bit count, the word count, the words and the position of the last marker.
+    return bits, offset + 8 + count * 8 + 4
+
+
+def _varint(data: bytes, offset: int) -> tuple[int, int]:
+    byte = data[offset]
+    value = byte & 0x7F
+    while byte & 0x80:
+        offset += 1
+        byte = data[offset]
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, offset + 1
+
+
+@dataclass(frozen=True)
+class Blob(os.PathLike):
+    """A file at a git ref, read from the object database instead of the working tree."""
+
+    git_dir: str
+    """The git directory holding the objects."""
+    path: str
+    """The path of the file in the tree, relative to the repository root."""
+    ref: str
+    """The ref the file was read at, e.g. `v2`."""
+    sha: str
+    """The SHA of the blob, which identifies its content."""
+
+    def __fspath__(self) -> str:
+        return self.path
+
+    def read(self) -> bytes:
+        """Return the content of the blob."""
+        return _object_database(self.git_dir).stream(bytes.fromhex(self.sha)).read()
+
+
+@lru_cache(maxsize=None)
+def _object_database(git_dir: str) -> gitdb.GitDB:
+    # gitdb reads loose and packed objects in Python. Unlike GitPython, importing it runs no `git`.
+    from gitdb import GitDB
+
+    return GitDB(os.path.join(git_dir, "objects"))
+
+
+def _peel_to_tree(database: gitdb.GitDB, sha: bytes) -> bytes:
+    """Return the SHA of the tree of a commit, following annotated tags."""
+    while True:
+        stream = database.stream(sha)
+        data = stream.read()
+        if stream.type == b"tag":
+            # `object <sha>` is the first header of a tag.
+            sha = bytes.fromhex(data[7:47].decode("ascii"))
+        elif stream.type == b"commit":
+            # `tree <sha>` is the first header of a commit.
+            return bytes.fromhex(data[5:45].decode("ascii"))
+        elif stream.type == b"tree":
+            return sha
+        else:
+            raise ValueError(f"Object {sha.hex()} is a {stream.type.decode()}, not a commit")
+
+
+def _tree_entry(data: bytes, name: bytes) -> tuple[int, bytes] | None:
+    """Return the mode and SHA of an entry of a tree object, whose entries are `<mode> <name>\\0<sha>`."""
+    # Object names are 20 bytes, `Repository.blob` rejects SHA-256 repositories.
+    offset = 0
+    while offset < len(data):
+        space = data.index(b" ", offset)
+        end = data.index(b"\0", space)
+        if data[space + 1 : end] == name:
+            return int(data[offset:space], 8), data[end + 1 : end + 21]
+        offset = end + 21
+    return None
+
+
+class Repository:
+    """A git repository, read directly from the files of its git directory.
+
+    Supports worktrees and submodules, whose `.git` is a file pointing to the git directory.
+    GitPython is only imported for repositories the reader does not support, like reftable refs
+    or configurations with includes.
+    """
+
+    def __init__(self, git_dir: Path, working_tree_dir: Path | None) -> None:
+        """
+        Initialize the repository.
+
+        Args:
+            git_dir: The git directory, e.g. `.git`, or `.git/worktrees/<name>` for a worktree.
+            working_tree_dir: The working tree of the repository, if it is not bare.
+        """
+        self.git_dir = str(git_dir)
+        self.working_tree_dir = None if working_tree_dir is None else str(working_tree_dir)
+        commondir = git_dir / "commondir"
+        if commondir.is_file():
+            self.common_dir = os.path.normpath(git_dir / commondir.read_text().strip())
+        else:
+            self.common_dir = self.git_dir
+        self._git_repo: git.Repo | None = None
+
+    @staticmethod
+    def open(path: Path) -> Repository:
+        """Open the repository containing `path`, searching parent directories.
+
+        Raises:
+            git.InvalidGitRepositoryError: If `path` is not in a git repository.
+        """
+        path = path.resolve()
+        for directory in (path, *path.parents):
+            dot_git = directory / ".git"
+            if dot_git.is_dir():
+                return Repository(dot_git, directory)
+            if dot_git.is_file():
+                # Worktrees and submodules: `gitdir: <path>`, relative to the `.git` file.
+                content = dot_git.read_text(encoding="utf-8").strip()
+                if content.startswith("gitdir:"):
+                    git_dir = directory / content[len("gitdir:") :].strip()
+                    return Repository(Path(os.path.normpath(git_dir)), directory)
+
+        import git
+
+        # Let GitPython find repositories configured through the environment, or raise.
+        return Repository.from_git(git.Repo(path, search_parent_directories=True))
+
+    @staticmethod
+    def from_git(git_repo: git.Repo) -> Repository:
+        """Wrap a GitPython repository."""
+        working_tree_dir = git_repo.working_tree_dir
+        repository = Repository(
+            Path(git_repo.git_dir), None if working_tree_dir is None else Path(working_tree_dir)
+        )
+        repository._git_repo = git_repo
+        return repository
+
+    @property
+    def git(self) -> git.Repo:
+        """The GitPython repository, used as a fallback.
+
+        Objects are read with the pure Python object database, without `git cat-file` processes.
+        """
+        if self._git_repo is None:
+            import git
+
+            _logger.debug(f"Opening '{self.git_dir}' with GitPython.")
+            self._git_repo = git.Repo(self.working_tree_dir or self.git_dir, odbt=git.GitDB)
+        return self._git_repo
+
+    def blob(self, ref: str, path: str) -> Blob | None:
+        """Return the file at a path in the tree of a ref, or `None` if there is no such file.
+
+        The tree is walked in the object database, loose or packed, without a checkout.
+
+        Raises:
+            ValueError: If the ref does not exist, or the repository uses SHA-256 object names.
+        """
+        if self.hash_size != 20:
+            # gitdb, and the tree walkers below, only read SHA-1 objects.
+            raise ValueError("objects of SHA-256 repositories cannot be read")
+        database = _object_database(self.common_dir)
+        sha = _peel_to_tree(database, bytes.fromhex(self.rev_parse(ref)))
+        mode = _TREE_MODE
+        for name in path.encode("utf-8").split(b"/"):
+            if mode != _TREE_MODE:
+                return None
+            if (entry := _tree_entry(database.stream(sha).read(), name)) is None:
+                return None
+            mode, sha = entry
+        if mode in (_TREE_MODE, _GITLINK_MODE):
+            return None
+        return Blob(self.common_dir, path, ref, sha.hex())
+
+    def rev_parse(self, ref: str) -> str:
+        """Return the SHA of a ref, a tag, a branch, or an abbreviated commit SHA.
+
+        Raises:
+            ValueError: If the ref does not exist.
+        """
+        if self.reftable:
+            try:
+                return self.git.rev_parse(ref).hexsha
+            except Exception as error:
+                raise ValueError(f"Unknown git ref '{ref}'") from error
+        if ref == "HEAD" and (sha := self.head_commit) is not None:
+            return sha
+        # Same precedence as git, see `gitrevisions(7)`.
+        for name in (
+            ref,
+            f"refs/{ref}",
+            f"refs/tags/{ref}",
+            f"refs/heads/{ref}",
+            f"refs/remotes/{ref}",
+        ):
+            if name.startswith("refs/") and (sha := self.resolve_ref(name)) is not None:
+                return sha
+        if _HEX_RE.fullmatch(ref):
+            try:
+                return _object_database(self.common_dir).partial_to_complete_sha_hex(ref).hex()
+            except Exception as error:
+                raise ValueError(f"Unknown git ref '{ref}'") from error
+        raise ValueError(f"Unknown git ref '{ref}'")
+
+    @cached_property
+    def config(self) -> list[tuple[str, str, str]]:
+        """The entries of the repository configuration."""
+        path = Path(self.common_dir) / "config"
+        if not path.is_file():
+            return []
+        return parse_config(path.read_text(encoding="utf-8", errors="surrogateescape"))
+
+    def config_value(self, section: str, key: str, default: str = "") -> str:
+        """Return the last value of a configuration key, like `git config --get`."""
+        values = [v for s, k, v in self.config if s == section and k == key]
+        return values[-1] if values else default
+
+    @property
+    def _has_includes(self) -> bool:
+        return any(
+            section == "include" or section.startswith("includeif") for section, _, _ in self.config
+        )
+
+    @property
+    def branch(self) -> str | None:
+        """The name of the checked out branch, or `None` if the HEAD is detached."""
+        if self.reftable:
+            head = self.git.head
+            return None if head.is_detached else head.ref.name
+        head = (Path(self.git_dir) / "HEAD").read_text(encoding="utf-8").strip()
+        if head.startswith("ref: refs/heads/"):
+            return head[len("ref: refs/heads/") :]
+        return None
+
+    @property
+    def head_commit(self) -> str | None:
+        """The SHA of the checked out commit, or `None` if the repository has no commits."""
+        if self.reftable:
+            return self.git.head.commit.hexsha if self.git.head.is_valid() else None
+        head = (Path(self.git_dir) / "HEAD").read_text(encoding="utf-8").strip()
+        if not head.startswith("ref: "):
+            return head
+        return self.resolve_ref(head[len("ref: ") :])
+
+    def resolve_ref(self, ref: str) -> str | None:
+        """Return the SHA a ref like `refs/heads/main` points to, read from `refs/` or `packed-refs`."""
+        for directory in (self.git_dir, self.common_dir):
+            path = Path(directory) / ref
+            if path.is_file():
+                content = path.read_text(encoding="utf-8").strip()
+                if content.startswith("ref: "):
+                    return self.resolve_ref(content[len("ref: ") :])
+                return content
+        for sha, name, _peeled in self._packed_refs():
+            if name == ref:
+                return sha
+        return None
+
+    def tags_at(self, sha: str) -> list[str]:
+        """Return the names of the tags pointing to a commit, sorted.
+
+        Annotated tags are matched through the peeled commits recorded in `packed-refs`.
+        Loose annotated tags point to a tag object, and are not matched.
+        """
+        if self.reftable:
+            return sorted(tag.name for tag in self.git.tags if tag.commit.hexsha == sha)
+        tags = {
+            name[len("refs/tags/") :]
+            for target, name, peeled in self._packed_refs()
+            if name.startswith("refs/tags/") and sha in (target, peeled)
+        }
+        tags_dir = Path(self.common_dir) / "refs" / "tags"
+        for path in tags_dir.rglob("*"):
+            if path.is_file() and path.read_text(encoding="utf-8").strip() == sha:
+                tags.add(path.relative_to(tags_dir).as_posix())
+        return sorted(tags)
+
+    def _packed_refs(self) -> list[tuple[str, str, str | None]]:
+        """Return the `(sha, ref, peeled sha)` entries of `packed-refs`."""
+        path = Path(self.common_dir) / "packed-refs"
+        if not path.is_file():
+            return []
+        entries: list[tuple[str, str, str | None]] = []
+        for line in path.read_text(encoding="utf-8").splitlines():
+            if line.startswith("^") and entries:
+                # The commit of the previous annotated tag.
+                entries[-1] = (*entries[-1][:2], line[1:])
+            elif line and not line.startswith("#"):
+                sha, _, name = line.partition(" ")
+                entries.append((sha, name, None))
+        return entries
+
+    def remote_urls(self) -> list[str]:
+        """Return the URLs of all remotes, in configuration order."""
+        if self._has_includes:
+            return [url for remote in self.git.remotes for url in remote.urls]
+        return [
+            value
+            for section, key, value in self.config
+            if section.startswith("remote.") and key == "url"
+        ]
+
+    @property
+    def reftable(self) -> bool:
+        """Whether the refs are stored in the reftable format, which the reader does not support."""
+        return self.config_value("extensions", "refstorage") == "reftable"
+
+    @cached_property
+    def hash_size(self) -> int:
+        """The size in bytes of the object names, 32 in SHA-256 repositories and 20 otherwise."""
+        return 32 if self.config_value("extensions", "objectformat") == "sha256" else 20
+
+    def tracked_files(self) -> list[str]:
+        """Return the paths of the files in the git index, relative to the working tree."""
+        try:
+            return read_index(Path(self.git_dir) / "index", self.hash_size)
+        except FileNotFoundError:
+            return []
+        except (UnsupportedRepository, struct.error, ValueError) as e:
+            # GitPython cannot read version 4 indexes, `git` reads them all.
+            _logger.debug(f"Listing the git index with `git ls-files`: {e}")
+            return [path for path in self.git.git.ls_files("--cached", "-z").split("\0") if path]
@@ -0,0 +1,186 @@
+"""Templates compiled for one set of options, with the options folded in as constants."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from jinja2 import BytecodeCache, nodes
+from jinja2.visitor import NodeTransformer
+
+from mkdocstrings_handlers.github.cache import content_hash
+
+if TYPE_CHECKING:
+    from jinja2 import Environment
+    from jinja2.bccache import Bucket
+
+    from mkdocstrings_handlers.github.config import GitHubOptions
+
+_MISSING = object()
+
+_CONSTANTS = (bool, int, float, str, type(None))
+"""Option values that can be folded into the compiled code."""
+
+_FOLDED = (nodes.Not, nodes.And, nodes.Or, nodes.Compare, nodes.CondExpr, nodes.Test)
+"""Expressions evaluated at compile time when their operands are constant.
+
+Filters and calls are left alone, as they may depend on the page being rendered.
+"""
+
+
+class OptionsFolder(NodeTransformer):
+    """Replace `options.<name>` with its value, and remove the branches that can never run.
+
+    Only templates that never assign `options` are folded. Macros are expected to receive
+    the options of the render in their `options` argument, like the default templates do.
+    """
+
+    def __init__(self, options: GitHubOptions, environment: Environment) -> None:
+        """
+        Initialize the folder.
+
+        Args:
+            options: The options to fold in.
+            environment: The environment the template is compiled in.
+        """
+        self.options = options
+        self.eval_ctx = nodes.EvalContext(environment)
+
+    def fold(self, template: nodes.Template) -> nodes.Template:
+        """Return the template with the options folded in, or unchanged if it assigns `options`."""
+        for name in template.find_all(nodes.Name):
+            if name.name == "options" and name.ctx == "store":
+                return template
+        folded = self.visit(template)
+        folded.set_environment(self.eval_ctx.environment)
+        return folded
+
+    def generic_visit(self, node: nodes.Node, *args: Any, **kwargs: Any) -> Any:
+        node = super().generic_visit(node, *args, **kwargs)
+        if isinstance(node, _FOLDED):
+            try:
+                return nodes.Const(node.as_const(self.eval_ctx), lineno=node.lineno)
+            except nodes.Impossible:
+                pass
+        return node
+
+    def visit_Getattr(self, node: nodes.Getattr) -> nodes.Node:
+        target = node.node
+        if isinstance(target, nodes.Name) and target.name == "options" and target.ctx == "load":
+            value = getattr(self.options, node.attr, _MISSING)
+            if isinstance(value, _CONSTANTS):
+                return nodes.Const(value, lineno=node.lineno)
+        return self.generic_visit(node)
+
+    def visit_And(self, node: nodes.And) -> nodes.Node:
+        node = self.generic_visit(node)
+        if isinstance(node, nodes.And) and isinstance(node.left, nodes.Const):
+            return node.right if node.left.value else node.left
+        return node
+
+    def visit_Or(self, node: nodes.Or) -> nodes.Node:
+        node = self.generic_visit(node)
+        if isinstance(node, nodes.Or) and isinstance(node.left, nodes.Const):
+            return node.left if node.left.value else node.right
+        return node
+
+    def visit_CondExpr(self, node: nodes.CondExpr) -> nodes.Node:
+        node = self.generic_visit(node)
+        if isinstance(node, nodes.CondExpr) and isinstance(node.test, nodes.Const):
+            if node.test.value:
+                return node.expr1
+            if node.expr2 is not None:
+                return node.expr2
+        return node
+
+    def visit_If(self, node: nodes.If) -> nodes.Node | list[nodes.Node]:
+        branches = []
+        else_ = self._visit_body(node.else_)
+        for branch in (node, *node.elif_):
+            test = self.visit(branch.test)
+            if not isinstance(test, nodes.Const):
+                branches.append(
+                    nodes.If(test, self._visit_body(branch.body), [], [], lineno=branch.lineno)
+                )
+            elif test.value:
+                # The following branches can never run, this one is the `else` of the previous ones.
+                else_ = self._visit_body(branch.body)
+                break
+        if not branches:
+            # `if` does not introduce a scope, so the body of a branch can replace the whole statement.
+            return else_
+        first, *others = branches
+        first.elif_ = others
+        first.else_ = else_
+        return first
+
+    def _visit_body(self, body: list[nodes.Node]) -> list[nodes.Node]:
+        visited: list[nodes.Node] = []
+        for node in body:
+            result = self.visit(node)
+            if isinstance(result, nodes.Node):
+                visited.append(result)
+            elif result is not None:
+                visited.extend(result)
+        return visited
+
+
+class VariantBytecodeCache(BytecodeCache):
+    """A bytecode cache storing the templates of a variant apart from the generic ones.
+
+    Buckets are keyed by the name and the source of a template, so the key of a
+    specialized template also includes the fingerprint of its options.
+    """
+
+    def __init__(self, cache: BytecodeCache, fingerprint: str) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            cache: The bytecode cache of the generic templates, which stores the buckets.
+            fingerprint: The fingerprint of the options of the variant.
+        """
+        self.cache = cache
+        self.fingerprint = fingerprint
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        self.cache.load_bytecode(bucket)
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        self.cache.dump_bytecode(bucket)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def get_cache_key(self, name: str, filename: str | None = None) -> str:
+        return self.cache.get_cache_key(f"{self.fingerprint}:{name}", filename)
+
+
+def specialize(
+    environment: Environment, options: GitHubOptions, cache_size: int = 400
+) -> Environment:
+    """Return an overlay of the environment that compiles templates for the given options.
+
+    The overlay shares the loader, filters and globals of the environment, and has its own
+    cache of compiled templates, so that included and imported templates are specialized too.
+    Its compiled templates are stored in the bytecode cache of the environment, if any,
+    under keys that include the options.
+
+    Arguments:
+        environment: The environment to specialize.
+        options: The options every template of the overlay is rendered with.
+        cache_size: The maximum number of compiled templates in the overlay.
+    """
+    bytecode_cache = environment.bytecode_cache
+    if bytecode_cache is not None:
+        bytecode_cache = VariantBytecodeCache(
+            bytecode_cache, content_hash(options.model_dump_json())
+        )
+    variant = environment.overlay(cache_size=cache_size, bytecode_cache=bytecode_cache)
+    folder = OptionsFolder(options, variant)
+    parse = variant._parse
+
+    def _parse(source: str, name: str | None, filename: str | None) -> nodes.Template:
+        return folder.fold(parse(source, name, filename))
+
+    variant._parse = _parse  # ty: ignore[invalid-assignment]
+    return variant
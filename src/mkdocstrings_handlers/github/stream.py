@@ -0,0 +1,124 @@
+"""Partial YAML loading from the parser's event stream."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Union
+
+from ruamel.yaml import YAML
+from ruamel.yaml.events import (
+    AliasEvent,
+    CollectionEndEvent,
+    CollectionStartEvent,
+    DocumentStartEvent,
+    MappingStartEvent,
+    ScalarEvent,
+    SequenceStartEvent,
+    StreamEndEvent,
+)
+from ruamel.yaml.nodes import ScalarNode
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from ruamel.yaml.events import Event
+
+ALL = True
+"""Load the whole node."""
+
+SKIP = None
+"""Skip the node, keeping the key of a mapping entry with a `None` value."""
+
+WILDCARD = "*"
+"""Key of a mapping spec that applies to all keys that are not listed."""
+
+Spec = Union[bool, None, Callable[[Any], Any], dict[Any, "Spec"]]
+"""What to load from a node.
+
+- `ALL` loads the whole node,
+- `SKIP` skips the node,
+- a mapping loads only the listed keys of a mapping, or the listed keys of every mapping in a sequence,
+- a callable loads a scalar and replaces it with the result of the call.
+"""
+
+_yaml = YAML(typ="safe", pure=False)
+
+
+class UnsupportedStream(Exception):
+    """The stream uses features that cannot be loaded partially, like aliases or tags."""
+
+
+def load_partial(source: str, spec: Spec) -> Any:
+    """Load the parts of a single YAML document selected by `spec`.
+
+    Nodes that are not selected are skipped as they are parsed, without being constructed.
+    Mapping keys are always kept, so that the presence of a key can still be tested.
+
+    Raises:
+        UnsupportedStream: If the selected parts use aliases, merge keys, explicit tags or complex keys.
+    """
+    events = iter(_yaml.parse(source))
+    data = None
+    for event in events:
+        if isinstance(event, DocumentStartEvent):
+            if data is not None:
+                raise UnsupportedStream("multiple documents")
+            data = _load(events, next(events), spec)
+        elif isinstance(event, StreamEndEvent):
+            break
+    return data
+
+
+def _load(events: Iterator[Event], event: Event, spec: Spec) -> Any:
+    if spec is SKIP:
+        _skip(events, event)
+        return None
+    if isinstance(event, ScalarEvent):
+        value = _scalar(event)
+        return spec(value) if callable(spec) else value
+    if isinstance(event, AliasEvent) or getattr(event, "tag", None) is not None:
+        raise UnsupportedStream("alias or tag")
+    if isinstance(event, SequenceStartEvent):
+        items = []
+        for item in events:
+            if isinstance(item, CollectionEndEvent):
+                return items
+            items.append(_load(events, item, spec))
+    if isinstance(event, MappingStartEvent):
+        mapping = {}
+        for key_event in events:
+            if isinstance(key_event, CollectionEndEvent):
+                return mapping
+            if not isinstance(key_event, ScalarEvent):
+                raise UnsupportedStream("complex key")
+            if key_event.value == "<<" and key_event.implicit[0]:
+                raise UnsupportedStream("merge key")
+            key = _scalar(key_event)
+            child = spec.get(key, spec.get(WILDCARD)) if isinstance(spec, dict) else spec
+            mapping[key] = _load(events, next(events), child)
+    raise UnsupportedStream(f"unexpected event {event}")
+
+
+def _skip(events: Iterator[Event], event: Event) -> None:
+    if not isinstance(event, CollectionStartEvent):
+        return
+    depth = 1
+    for event in events:
+        if isinstance(event, CollectionStartEvent):
+            depth += 1
+        elif isinstance(event, CollectionEndEvent):
+            depth -= 1
+            if depth == 0:
+                return
+
+
+def _scalar(event: ScalarEvent) -> Any:
+    if event.tag is not None:
+        raise UnsupportedStream("explicit tag")
+    if not event.implicit[0]:
+        # Quoted or block scalar.
+        return event.value
+    tag = _yaml.resolver.resolve(ScalarNode, event.value, event.implicit)
+    construct = _yaml.constructor.yaml_constructors.get(tag.value)
+    if construct is None:
+        raise UnsupportedStream(f"implicit tag {tag.value}")
+    return construct(_yaml.constructor, ScalarNode(tag, event.value))
@@ -0,0 +1,145 @@
+"""The parameters of an action or workflow, prepared once per render for the templates."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Generic, Literal
+
+from mkdocstrings_handlers.github.objects import P, Workflow
+from mkdocstrings_handlers.github.rendering import anchor_id
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from mkdocstrings_handlers.github.config import GitHubOptions
+    from mkdocstrings_handlers.github.objects import Action, Input, Output, Secret
+
+SectionName = Literal["inputs", "outputs", "secrets"]
+
+
+@dataclass(frozen=True, slots=True)
+class Section(Generic[P]):
+    """The shown parameters of one section, ordered, filtered and grouped."""
+
+    name: SectionName
+    header_id: str
+    parameters: list[P] = field(default_factory=list)
+    groups: list[tuple[str, list[P]]] = field(default_factory=list)
+    """The parameters by group, in order of first appearance. A single unnamed group when not grouping."""
+    anchors: dict[str, str] = field(default_factory=dict)
+    """The anchor of every parameter, by name."""
+    default_column: bool = False
+    """Whether any parameter has a default value to show in its own column."""
+
+
+@dataclass(frozen=True, slots=True)
+class View:
+    """What the templates show of an action or workflow with given options."""
+
+    id: str
+    signature_inputs: list[Input]
+    """The required inputs in the signature."""
+    signature_secrets: list[Secret]
+    """The required secrets in the signature, annotated after the inputs."""
+    inputs: Section[Input]
+    secrets: Section[Secret]
+    outputs: Section[Output]
+    description: str | None
+    """The description to convert from Markdown, if shown and not overridden by the options."""
+
+    def descriptions(self) -> dict[str, list[str]]:
+        """Return the descriptions the templates convert from Markdown, by the id of their parent element.
+
+        Descriptions in the signature are converted without a parent id, the others with the object id.
+        """
+        signature = [parameter.description for parameter in self.signature_inputs]
+        signature.extend(parameter.description for parameter in self.signature_secrets)
+        texts = [
+            parameter.description
+            for section in (self.inputs, self.secrets, self.outputs)
+            for parameter in section.parameters
+        ]
+        if self.description is not None:
+            texts.append(self.description)
+        return {"": signature, self.id: texts}
+
+
+def _section(
+    name: SectionName,
+    parameters: Sequence[P],
+    data: Workflow | Action,
+    options: GitHubOptions,
+    *,
+    shown: bool,
+    only_required: bool = False,
+) -> Section[P]:
+    header_id = f"{name}-{data.id.replace('/', '-').replace('.', '').lower()}"
+    if not shown:
+        return Section(name, header_id)
+    shown_parameters: list[P] = []
+    groups: dict[str, list[P]] = {}
+    anchors: dict[str, str] = {}
+    default_column = False
+    for parameter in parameters:
+        if only_required and not getattr(parameter, "required", False):
+            continue
+        shown_parameters.append(parameter)
+        group = parameter.group if options.parameters_groups else ""
+        groups.setdefault(group, []).append(parameter)
+        anchors[parameter.name] = anchor_id(parameter.name, name, data.id)
+        default_column = default_column or bool(getattr(parameter, "default", None))
+    return Section(
+        name,
+        header_id,
+        shown_parameters,
+        list(groups.items()),
+        anchors,
+        default_column,
+    )
+
+
+def build_view(data: Workflow | Action, options: GitHubOptions) -> View:
+    """Order, filter and group the parameters of an object in a single pass.
+
+    Arguments:
+        data: The action or workflow to render.
+        options: The options to render it with.
+    """
+    alphabetical = options.parameters_order == "alphabetical"
+    inputs = sorted(data.inputs, key=lambda x: x.name) if alphabetical else data.inputs
+    outputs = sorted(data.outputs, key=lambda x: x.name) if alphabetical else data.outputs
+    secrets: Sequence[Secret] = data.secrets if isinstance(data, Workflow) else []
+    if alphabetical:
+        secrets = sorted(secrets, key=lambda x: x.name)
+
+    signature_inputs: list[Input] = []
+    signature_secrets: list[Secret] = []
+    if options.show_signature:
+        signature_inputs = [i for i in inputs if i.required]
+        signature_secrets = [s for s in secrets if s.required]
+
+    return View(
+        id=data.id,
+        signature_inputs=signature_inputs,
+        signature_secrets=signature_secrets,
+        inputs=_section(
+            "inputs",
+            inputs,
+            data,
+            options,
+            shown=options.show_inputs,
+            only_required=options.show_inputs_only_required,
+        ),
+        secrets=_section(
+            "secrets",
+            secrets,
+            data,
+            options,
+            shown=options.show_secrets,
+            only_required=options.show_secrets_only_required,
+        ),
+        outputs=_section("outputs", outputs, data, options, shown=options.show_outputs),
+        description=(
+            data.description if options.show_description and not options.description else None
+        ),
+    )
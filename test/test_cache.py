@@ -0,0 +1,348 @@
+"""Tests for the `cache` module."""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+import pytest
+from jinja2 import Environment
+from markdown import Markdown
+
+from mkdocstrings_handlers.github import GitHubHandler, cache
+from mkdocstrings_handlers.github.cache import (
+    DiskCache,
+    HighlightCache,
+    LRUCache,
+    RenderCache,
+    Rendered,
+)
+from mkdocstrings_handlers.github.config import GitHubConfig, GitHubOptions
+from mkdocstrings_handlers.github.objects import Action
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_disk_cache_roundtrip(tmp_path: Path) -> None:
+    """Assert values survive a new cache instance on the same directory."""
+    key = DiskCache.key("action.yml", cache.content_hash("name: test"))
+    DiskCache(tmp_path, max_size=1024 * 1024).set(key, {"name": "test"})
+
+    assert DiskCache(tmp_path, max_size=1024 * 1024).get(key) == {"name": "test"}
+    assert DiskCache(tmp_path, max_size=1024 * 1024).get("missing") is None
+
+
+def test_disk_cache_key_depends_on_content() -> None:
+    """Assert the same path with different content yields different keys."""
+    assert DiskCache.key("action.yml", cache.content_hash("a")) != DiskCache.key(
+        "action.yml", cache.content_hash("b")
+    )
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    """Assert the oldest entries are evicted when the cache exceeds its size."""
+    disk_cache = DiskCache(tmp_path, max_size=2500)
+    disk_cache.set("first", b"x" * 1000)
+    disk_cache.set("second", b"x" * 1000)
+    os.utime(disk_cache._entry("first"), (0, 0))
+    os.utime(disk_cache._entry("second"), (1, 1))
+    disk_cache.set("third", b"x" * 1000)
+
+    assert disk_cache.get("first") is None
+    assert disk_cache.get("second") is not None
+    assert disk_cache.get("third") is not None
+
+
+def test_disk_cache_invalidated_on_version_change(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert entries of another handler version are removed, and other directories are kept."""
+    DiskCache(tmp_path, max_size=1024).set("key", "value")
+    (tmp_path / "plugin" / "data").mkdir(parents=True)
+    (tmp_path / "1.0-beta").mkdir()
+
+    monkeypatch.setattr(cache, "handler_version", lambda: "99.0.0")
+    disk_cache = DiskCache(tmp_path, max_size=1024)
+
+    assert disk_cache.get("key") is None
+    assert sorted(entry.name for entry in tmp_path.iterdir()) == sorted(
+        ["1.0-beta", "plugin", disk_cache.directory.name]
+    )
+    assert (tmp_path / "plugin" / "data").is_dir()
+
+
+def test_disk_cache_discards_corrupt_entries(tmp_path: Path) -> None:
+    """Assert unreadable entries are treated as misses."""
+    disk_cache = DiskCache(tmp_path, max_size=1024)
+    disk_cache._entry("key").write_bytes(b"not a pickle")
+
+    assert disk_cache.get("key") is None
+    assert not disk_cache._entry("key").exists()
+
+
+def test_collect_uses_disk_cache(
+    handler: GitHubHandler, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert unchanged files are not parsed again."""
+    handler.disk_cache = DiskCache(tmp_path, max_size=1024 * 1024)
+    collected = handler.collect(".", {})
+
+    def fail(*args, **kwargs):
+        raise AssertionError("File should not be parsed again.")
+
+    monkeypatch.setattr(Action, "from_source", fail)
+    handler.collected.clear()
+    assert handler.collect(".", {}) == collected
+
+
+def test_disk_cache_key_depends_on_parse_mode(
+    handler: GitHubHandler, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert objects parsed in another mode are parsed again."""
+    handler.disk_cache = DiskCache(tmp_path, max_size=1024 * 1024)
+    monkeypatch.setattr(handler.config, "parse_mode", "fast")
+    handler.collect(".", {})
+    assert len(list(handler.disk_cache.directory.glob("*.pickle"))) == 1
+
+    monkeypatch.setattr(handler.config, "parse_mode", "roundtrip")
+    handler.collected.clear()
+    handler.collect(".", {})
+    assert len(list(handler.disk_cache.directory.glob("*.pickle"))) == 2
+
+
+def test_lru_cache_discards_least_recently_used() -> None:
+    """Assert the LRU cache is bounded and refreshes items on access."""
+    lru: LRUCache[str, int] = LRUCache(max_size=2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == 1
+    lru.set("c", 3)
+
+    assert "a" in lru
+    assert "b" not in lru
+    assert len(lru) == 2
+
+
+def test_lru_cache_calls_on_evict() -> None:
+    """Assert discarded items are passed to the eviction callback."""
+    evicted: list[int] = []
+    lru: LRUCache[str, int] = LRUCache(max_size=1, on_evict=evicted.append)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert evicted == [1]
+
+
+def test_lru_cache_disabled() -> None:
+    """Assert a cache of size 0 stores nothing."""
+    lru: LRUCache[str, int] = LRUCache(max_size=0)
+    lru.set("a", 1)
+    assert lru.get("a") is None
+
+
+def test_collect_memoizes_per_identifier(
+    handler: GitHubHandler, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert an identifier is parsed once while its file is unchanged."""
+    collected = handler.collect("actions/minimal-action", {})
+
+    def fail(*args, **kwargs):
+        raise AssertionError("File should not be parsed again.")
+
+    monkeypatch.setattr(handler, "_parse", fail)
+    assert handler.collect("actions/minimal-action", {}) is collected
+
+
+def test_collect_upgrades_narrow_objects(handler: GitHubHandler) -> None:
+    """Assert an object collected for narrow options is collected again for wider options."""
+    identifier = ".github/workflows/reusable-workflow.yml"
+    narrow = handler.collect(identifier, GitHubOptions(workflow_chart=False))
+    assert narrow is not None
+    assert narrow.jobs == {}
+    assert handler.collect(identifier, GitHubOptions(workflow_chart=False)) is narrow
+
+    wide = handler.collect(identifier, GitHubOptions(workflow_chart=True))
+    assert wide is not None
+    assert wide.jobs
+    assert handler.collect(identifier, GitHubOptions(workflow_chart=False)) is wide
+
+
+def test_render_cache_shares_page_independent_html(tmp_path: Path, caplog) -> None:
+    """Assert HTML is shared between pages unless it has relative links."""
+    render_cache = RenderCache(8, DiskCache(tmp_path, max_size=1024 * 1024))
+    components = {"data": "a", "options": "b"}
+    render_cache.set(components, "one.md", Rendered('<a href="#x">x</a>', []))
+    render_cache.set({**components, "data": "c"}, "one.md", Rendered('<a href="../x/">x</a>', []))
+
+    assert render_cache.get("a", components, "two.md") is not None
+    assert render_cache.get("c", {**components, "data": "c"}, "one.md") is not None
+    with caplog.at_level("DEBUG"):
+        assert render_cache.get("c", {**components, "data": "c"}, "two.md") is None
+    assert "Rendering 'c' (changed page)" in caplog.text
+
+    # The disk tier survives a new instance.
+    render_cache = RenderCache(8, DiskCache(tmp_path, max_size=1024 * 1024))
+    with caplog.at_level("DEBUG"):
+        assert render_cache.get("a", components, "two.md") is not None
+        assert render_cache.get("a", {**components, "options": "d"}, "two.md") is None
+    assert "Rendering 'a' (changed options)" in caplog.text
+
+
+def test_render_reuses_html_and_replays_headings(handler: GitHubHandler) -> None:
+    """Assert a cached render registers the same headings as a fresh one."""
+    options = handler.get_options({"show_heading": True, "show_inputs": True})
+    data = handler.collect("actions/simple-action", options)
+    assert data is not None
+
+    html = handler.render(data, options)
+    headings = handler.get_headings()
+    assert headings
+    assert handler.render(data, options) is html
+    replayed = handler.get_headings()
+    assert [heading.attrib for heading in replayed] == [heading.attrib for heading in headings]
+    assert replayed[0] is not headings[0]
+
+    other = handler.get_options({"show_heading": True, "show_inputs": False})
+    assert handler.render(data, other) != html
+    assert len(handler.render_cache.memory) == 2
+
+
+def test_markdown_fingerprint() -> None:
+    """Assert the fingerprint follows the extension configuration, and is stable across builds."""
+
+    def slugify(value: str, separator: str) -> str:
+        return value
+
+    config = {"toc": {"permalink": True, "slugify": slugify}}
+    fingerprint = cache.markdown_fingerprint(["toc"], config)
+    assert fingerprint == cache.markdown_fingerprint(["toc"], {"toc": {**config["toc"]}})
+    assert "0x" not in str(cache._qualified_name(slugify))
+    assert fingerprint != cache.markdown_fingerprint(["toc"], {"toc": {"permalink": "#"}})
+    assert fingerprint != cache.markdown_fingerprint(["toc", "attr_list"], config)
+
+
+def test_render_cache_key_depends_on_markdown_and_highlighter(handler: GitHubHandler) -> None:
+    """Assert rendered HTML is not reused after the Markdown extensions change."""
+    options = handler.get_options({})
+    data = handler.collect("actions/simple-action", options)
+    assert data is not None
+    components = handler._render_components(data, options)
+    assert components["highlighter"]
+    assert components == handler._render_components(data, options)
+
+    other = GitHubHandler(
+        config=handler.config,
+        repo=handler.repo,
+        base_dir=handler.base_dir,
+        theme="material",
+        custom_templates=None,
+        mdx=handler.mdx,
+        mdx_config={**handler.mdx_config, "toc": {"permalink": "#"}},
+    )
+    assert other._render_components(data, options)["markdown"] != components["markdown"]
+
+
+def test_render_does_not_load_source(handler: GitHubHandler) -> None:
+    """Assert objects are keyed by the hash of their parsed source, without reading it again."""
+    options = handler.get_options({"show_source": False})
+    data = handler.collect("actions/simple-action", options)
+    assert data is not None
+    data.release_source()
+    handler.render(data, options)
+    assert data.source_hash
+    assert "source" not in vars(data)
+
+
+def test_highlight_cache(tmp_path: Path) -> None:
+    """Assert code is highlighted once per content, arguments and highlighter configuration."""
+    calls = []
+
+    def highlight(src: str, language: str | None = None, *, linenums: bool | None = None) -> str:
+        calls.append((src, language, linenums))
+        return f"<pre>{src}</pre>"
+
+    highlight_cache = HighlightCache(8, DiskCache(tmp_path, max_size=1024 * 1024))
+    cached = highlight_cache.wrap(highlight, "config")
+    assert cached("on: push", language="yaml", linenums=True) == "<pre>on: push</pre>"
+    assert cached("on: push", language="yaml", linenums=True) == "<pre>on: push</pre>"
+    assert len(calls) == 1
+    cached("on: push", language="yaml", linenums=False)
+    highlight_cache.wrap(highlight, "other config")("on: push", language="yaml", linenums=True)
+    assert len(calls) == 3
+
+    # The disk tier survives a new instance.
+    cached = HighlightCache(8, DiskCache(tmp_path, max_size=1024 * 1024)).wrap(highlight, "config")
+    cached("on: push", language="yaml", linenums=True)
+    assert len(calls) == 3
+
+
+def test_render_source_highlighted_once(handler: GitHubHandler) -> None:
+    """Assert the source of an object is not highlighted again by another render."""
+    options = handler.get_options({"show_source": True})
+    data = handler.collect("actions/simple-action", options)
+    assert data is not None
+    handler.render(data, options)
+    assert len(handler.highlight_cache.memory) > 0
+
+    handler.render_cache.memory.clear()
+    size = len(handler.highlight_cache.memory)
+    other = handler.get_options({"show_source": True, "show_inputs": False})
+    assert "highlight" in handler.render(data, other)
+    assert len(handler.highlight_cache.memory) == size
+
+
+def test_convert_markdown_reuses_html_and_replays_headings(
+    handler: GitHubHandler, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert a description is converted once, and its headings are registered every time."""
+    conversions = []
+    convert = handler.md.convert
+    monkeypatch.setattr(
+        handler.md, "convert", lambda text: conversions.append(text) or convert(text)
+    )
+
+    text = "## Usage\n\nThe `token` input."
+    html = handler.do_convert_markdown(text, 2, "deploy")
+    headings = handler.get_headings()
+    assert headings
+    assert handler.do_convert_markdown(text, 2, "deploy") == html
+    replayed = handler.get_headings()
+    assert len(conversions) == 1
+    assert [heading.attrib for heading in replayed] == [heading.attrib for heading in headings]
+    assert replayed[0] is not headings[0]
+
+    assert handler.do_convert_markdown(text, 2, "other") != html
+    assert len(conversions) == 2
+
+
+def test_templates_bytecode_cache(
+    handler: GitHubHandler, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert templates compiled by one handler are loaded from disk by the next one."""
+    config = GitHubConfig(cache=True, cache_dir=str(tmp_path), options=handler.config.options)
+
+    def start() -> GitHubHandler:
+        new = GitHubHandler(
+            config=config,
+            repo=handler.repo,
+            base_dir=handler.base_dir,
+            theme="material",
+            custom_templates=None,
+            mdx=handler.mdx,
+            mdx_config=handler.mdx_config,
+        )
+        new._update_env(Markdown(), config=None)
+        return new
+
+    first = start()
+    assert list((first.disk_cache.directory / "templates").iterdir())
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Templates should not be compiled again.")
+
+    monkeypatch.setattr(Environment, "compile", fail)
+    second = start()
+    options = second.get_options({})
+    data = second.collect("actions/simple-action", options)
+    assert data is not None
+    assert second.render(data, options)
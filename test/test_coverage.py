@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
-from unittest.mock import Mock
+from unittest.mock import Mock, PropertyMock
 
 import pytest
 from mkdocs.exceptions import PluginError
@@ -14,6 +14,7 @@ from mkdocstrings_handlers.github.objects import (
     Workflow,
     _get_member,
 )
+from mkdocstrings_handlers.github.releases import VersionSnapshot
 from mkdocstrings_handlers.github.rendering import (
     anchor_id,
     as_string,
@@ -22,6 +23,7 @@ from mkdocstrings_handlers.github.rendering import (
     indent_text,
     wrap_signature_block,
 )
+from mkdocstrings_handlers.github.repository import Repository
 
 if TYPE_CHECKING:
     from mkdocstrings_handlers.github import GitHubHandler
@@ -99,31 +101,28 @@ class TestRendering:
         assert result == "parent-id--input.my-name"
 
     def test_format_action_signature_non_repo(self):
-        """Test format_action_signature when git_repo is not a Repo instance."""
+        """Test format_action_signature when there is no git repository."""
         from mkdocstrings_handlers.github.config import GitHubOptions
 
-        # Test with ref version when git_repo is not a Repo
+        # Test with ref version when there is no repository
         context = Mock()
-        context.environment.globals = {"git_repo": "not_a_repo"}
+        context.environment.globals = {"versions": VersionSnapshot(None, None, environ={})}
 
         options = GitHubOptions(signature_version="ref")
         result = format_action_signature(context, ".", "owner/repo", options)
         assert result == "owner/repo@unknown"
 
     def test_format_action_signature_exception_handling(self):
-        """Test format_action_signature when accessing head.ref.name raises exception."""
-        import git
-
+        """Test format_action_signature when reading the git HEAD raises exception."""
         from mkdocstrings_handlers.github.config import GitHubOptions
 
-        # Create a mock that is a Repo instance but raises exception when accessing head.ref.name
         context = Mock()
 
-        # Create an actual Repo type mock with side effect
-        mock_repo = Mock(spec=git.Repo)
-        type(mock_repo.head.ref).name = Mock(side_effect=Exception("Test exception"))
+        # Create a repository mock with side effect
+        mock_repo = Mock(spec=Repository)
+        type(mock_repo).branch = PropertyMock(side_effect=OSError("Test exception"))
 
-        context.environment.globals = {"git_repo": mock_repo}
+        context.environment.globals = {"versions": VersionSnapshot(mock_repo, None, environ={})}
 
         options = GitHubOptions(signature_version="ref")
         result = format_action_signature(context, ".", "owner/repo", options)
@@ -291,7 +290,7 @@ class TestHandler:
         original_repo = handler.repo
         original_semver = handler.semver
         original_major = handler.major
-        handler.repo = repo
+        handler.repo = Repository.from_git(repo)
         # Reset values so get_releases starts fresh
         handler.semver = ""
         handler.major = ""
@@ -350,7 +349,7 @@ class TestHandler:
 
         # Replace the handler's repo with our test repo
         original_repo = handler.repo
-        handler.repo = repo
+        handler.repo = Repository.from_git(repo)
 
         # Temporarily clear GITHUB_ACTIONS and GITHUB_REPOSITORY env vars
         # to ensure the test actually checks the remote URL logic
@@ -0,0 +1,117 @@
+"""Tests for the `diff` module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import git
+import pytest
+
+from mkdocstrings_handlers.github.diff import diff_parameters, diff_permissions
+from mkdocstrings_handlers.github.objects import Input, PermissionLevel, PermissionSet
+from mkdocstrings_handlers.github.repository import Repository
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from mkdocstrings_handlers.github import GitHubHandler
+
+WORKFLOW = """\
+name: Deploy
+on:
+  workflow_call:
+    inputs:
+{inputs}
+permissions:
+  contents: {contents}
+jobs: {{}}
+"""
+
+
+def test_diff_parameters() -> None:
+    """Assert parameters are matched by name, ignoring their order and group."""
+    old = [Input("a"), Input("b", required=True), Input("c", group="x")]
+    new = [Input("d"), Input("c", group="y"), Input("b", type="number", default=1)]
+    changes = diff_parameters(old, new)
+
+    assert [(change.name, change.kind) for change in changes] == [
+        ("d", "added"),
+        ("b", "changed"),
+        ("a", "removed"),
+    ]
+    assert changes[1].fields == ("required", "type", "default")
+
+
+def test_diff_permissions() -> None:
+    """Assert added, removed and changed scopes are reported."""
+    old = PermissionSet.parse({"contents": "read", "issues": "write"})
+    new = PermissionSet.parse({"contents": "write", "packages": "read"})
+    changes = diff_permissions(old, new)
+
+    assert [(change.name, change.old, change.new) for change in changes] == [
+        ("contents", PermissionLevel.read, PermissionLevel.write),
+        ("packages", None, PermissionLevel.read),
+        ("issues", PermissionLevel.write, None),
+    ]
+
+
+def test_render_diff(handler: GitHubHandler, tmp_path: Path) -> None:
+    """Assert the changes since a ref are rendered from the previous git objects."""
+    repo = git.Repo.init(tmp_path)
+    workflow = tmp_path / ".github" / "workflows" / "deploy.yml"
+    workflow.parent.mkdir(parents=True)
+    workflow.write_text(
+        WORKFLOW.format(inputs="      env:\n        type: string", contents="read"),
+        encoding="utf-8",
+    )
+    repo.index.add([".github/workflows/deploy.yml"])
+    repo.index.commit("v1", author=git.Actor("Test", "test@example.com"))
+    repo.create_tag("v1")
+    workflow.write_text(
+        WORKFLOW.format(inputs="      dry-run:\n        type: boolean", contents="write"),
+        encoding="utf-8",
+    )
+    handler.repo = Repository.open(tmp_path)
+
+    options = handler.get_options({"diff_ref": "v1"})
+    html = handler.render(handler.collect(".github/workflows/deploy.yml", options), options)
+
+    assert "Changes since <code>v1</code>" in html
+    assert 'class="doc-section-item gh-diff-added"' in html
+    assert "<code>dry-run</code>" in html
+    assert "<code>env</code>" in html
+    assert "<code>read</code>" in html
+    assert "<code>write</code>" in html
+
+
+def test_render_diff_cached(
+    handler: GitHubHandler, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert a cached render does not compare the object again, unless the ref moved."""
+    repo = git.Repo.init(tmp_path)
+    workflow = tmp_path / ".github" / "workflows" / "deploy.yml"
+    workflow.parent.mkdir(parents=True)
+    inputs = "      env:\n        type: string"
+
+    def commit(contents: str) -> None:
+        workflow.write_text(WORKFLOW.format(inputs=inputs, contents=contents), encoding="utf-8")
+        repo.index.add([".github/workflows/deploy.yml"])
+        repo.index.commit(contents, author=git.Actor("Test", "test@example.com"))
+        repo.create_tag("v1", force=True)
+
+    commit("read")
+    workflow.write_text(WORKFLOW.format(inputs=inputs, contents="write"), encoding="utf-8")
+    handler.repo = Repository.open(tmp_path)
+    options = handler.get_options({"diff_ref": "v1"})
+    data = handler.collect(".github/workflows/deploy.yml", options)
+    html = handler.render(data, options)
+    assert "<code>read</code>" in html
+
+    diff = handler._diff
+    monkeypatch.setattr(handler, "_diff", None)
+    assert handler.render(data, options) is html
+    monkeypatch.setattr(handler, "_diff", diff)
+
+    # The tag now points to a commit with the same permissions.
+    commit("write")
+    assert "<code>read</code>" not in handler.render(data, options)
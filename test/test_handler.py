@@ -4,13 +4,18 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import git
 import pytest
+from mkdocs.config.defaults import MkDocsConfig
 from mkdocstrings import CollectionError
 
 from mkdocstrings_handlers.github import GitHubHandler
+from mkdocstrings_handlers.github.handler import _serving
+from mkdocstrings_handlers.github.index import IdentifierIndex
+from mkdocstrings_handlers.github.repository import Repository
 
 if TYPE_CHECKING:
-    pass
+    from pathlib import Path
 
 
 @pytest.mark.parametrize(
@@ -79,3 +84,203 @@ def test_collect_repo_github_actions(handler: GitHubHandler) -> None:
 def test_collect_repo_git(handler: GitHubHandler) -> None:
     """Assert error is raised when no repo is configured."""
     assert handler.get_repository_name() == "watermarkhu/mkdocstrings-github-fixture"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_collect_many(handler: GitHubHandler, workers: int) -> None:
+    """Assert a batch collects the same objects serially and in worker processes."""
+    handler.collect("actions/minimal-action", {})
+    identifiers = [
+        ".",
+        "actions/minimal-action",
+        "actions/simple-action",
+        ".github/workflows/reusable-workflow.yml",
+    ]
+    handler.config.collect_workers = workers
+    handler.config.collect_parallel_threshold = 2
+    try:
+        collected = handler.collect_many(identifiers, {})
+    finally:
+        handler.teardown()
+
+    assert list(collected) == identifiers
+    for identifier, data in collected.items():
+        assert data is not None
+        assert handler.collect(identifier, {}) is data
+
+
+def test_collect_at_ref(handler: GitHubHandler, tmp_path: Path) -> None:
+    """Assert identifiers are collected at a git ref, parsing unchanged files once."""
+    repo = git.Repo.init(tmp_path)
+    (tmp_path / "deploy").mkdir()
+    for version in ("v1", "v2", "v3"):
+        if version != "v3":
+            (tmp_path / "deploy" / "action.yml").write_text(
+                f"name: Deploy\ndescription: Deploy {version}\nruns:\n  using: node20\n",
+                encoding="utf-8",
+            )
+            repo.index.add(["deploy/action.yml"])
+            repo.index.commit(version, author=git.Actor("Test", "test@example.com"))
+        repo.create_tag(version)
+    (tmp_path / "deploy" / "action.yml").unlink()
+    handler.repo = Repository.open(tmp_path)
+
+    assert handler.collect("./deploy@v1", {}).description == "Deploy v1"
+    v2 = handler.collect("./deploy@v2", {})
+    v3 = handler.collect("./deploy@v3", {})
+    assert (v2.description, v3.description) == ("Deploy v2", "Deploy v2")
+    assert (v2.ref, v3.ref, v3.id) == ("v2", "v3", "./deploy")
+    assert len(handler.blobs) == 2
+    assert handler.collect_many(["deploy@v1"], {})["deploy@v1"].description == "Deploy v1"
+    # Spellings of a path share the parsed blob, but keep their own id and anchors.
+    assert handler.collect("deploy@v1", {}).id == "deploy"
+
+    with pytest.raises(CollectionError, match="Unknown git ref 'v4'"):
+        handler.collect("deploy@v4", {})
+    with pytest.raises(
+        CollectionError, match="is not a valid workflow file or action directory at 'v1'"
+    ):
+        handler.collect("build@v1", {})
+
+
+def test_collect_tracked_path_with_at(handler: GitHubHandler, tmp_path: Path) -> None:
+    """Assert tracked paths containing `@` are collected from the working tree, not at a ref."""
+    repo = git.Repo.init(tmp_path)
+    (tmp_path / "deploy@v2").mkdir()
+    (tmp_path / "deploy@v2" / "action.yml").write_text(
+        "name: Deploy\ndescription: Deploy\nruns:\n  using: node20\n", encoding="utf-8"
+    )
+    repo.index.add(["deploy@v2/action.yml"])
+    handler.repo = Repository.open(tmp_path)
+    handler.index = IdentifierIndex.from_repo(handler.repo)
+
+    data = handler.collect("deploy@v2", {})
+    assert (data.id, data.ref) == ("deploy@v2", None)
+
+
+DESCRIPTIONS = [
+    "The `token` used to *authenticate*.",
+    "- first\n- second",
+    "1. one\n\n2. two",
+    "!!! note\n    Admonitions are kept together.",
+    "| Name | Value |\n| ---- | ----- |\n| a | 1 |",
+    "```yaml\non: push\n```",
+    "A hard  \nline break.",
+    "    indented code",
+    "> A quote\nwith lazy continuation.",
+    "See [the docs](https://example.com) and [relative](../other.md).",
+    "## Usage\n\nHeadings are converted one by one.",
+    "A footnote[^1].\n\n[^1]: Footnotes are numbered per conversion.",
+    "A [reference][ref].\n\n[ref]: https://example.com",
+    "<div markdown>\n*HTML* block\n</div>",
+    "The `token` used to *authenticate*.",
+    "",
+]
+
+
+@pytest.mark.parametrize("html_id", ["", "deploy"])
+def test_batch_conversion_is_identical(handler: GitHubHandler, html_id: str) -> None:
+    """Assert descriptions converted in one pass have the same HTML as converted one by one."""
+    expected = []
+    for text in DESCRIPTIONS:
+        handler.converted.clear()
+        expected.append(handler.do_convert_markdown(text, 2, html_id))
+    expected_headings = handler.get_headings()
+    handler.converted.clear()
+
+    handler._convert_batch(DESCRIPTIONS, 2, html_id)
+    assert len(handler.converted) == 10
+    assert [handler.do_convert_markdown(text, 2, html_id) for text in DESCRIPTIONS] == expected
+    assert [heading.attrib for heading in handler.get_headings()] == [
+        heading.attrib for heading in expected_headings
+    ]
+
+
+PAGE_LEVEL_DESCRIPTIONS = [
+    "A paragraph with an id.\n{: #custom }",
+    "Some *text*{ .em }",
+    "The HTML abbreviation.\n\n*[HTML]: Hyper Text Markup Language",
+    "Uses HTML too.",
+    "<div markdown>\n*HTML* block\n</div>",
+    "Term\n: Definition",
+]
+
+
+@pytest.mark.parametrize(
+    "handler",
+    [
+        {
+            "markdown_extensions": [
+                {"attr_list": {}},
+                {"abbr": {}},
+                {"md_in_html": {}},
+                {"def_list": {}},
+            ]
+        }
+    ],
+    indirect=["handler"],
+)
+def test_batch_conversion_skips_page_level_constructs(handler: GitHubHandler) -> None:
+    """Assert ids, attributes and abbreviations do not leak between descriptions of one pass."""
+    expected = []
+    for text in PAGE_LEVEL_DESCRIPTIONS:
+        handler.converted.clear()
+        expected.append(handler.do_convert_markdown(text, 2, "deploy"))
+    handler.converted.clear()
+
+    handler._convert_batch(PAGE_LEVEL_DESCRIPTIONS, 2, "deploy")
+    assert len(handler.converted) == 2
+    assert [
+        handler.do_convert_markdown(text, 2, "deploy") for text in PAGE_LEVEL_DESCRIPTIONS
+    ] == expected
+    assert "<abbr" not in expected[3]
+
+
+def test_render_converts_descriptions_in_one_pass(
+    handler: GitHubHandler, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert rendering a workflow does not convert its descriptions one by one."""
+    conversions = []
+    convert = handler.md.convert
+    monkeypatch.setattr(
+        handler.md, "convert", lambda text: conversions.append(text) or convert(text)
+    )
+    options = handler.get_options({"show_inputs": True, "show_secrets": True, "show_outputs": True})
+    data = handler.collect(".github/workflows/reusable-workflow.yml", options)
+    assert data is not None
+
+    handler.render(data, options)
+    descriptions = [parameter.description for parameter in [*data.inputs, *data.outputs]]
+    assert len(set(descriptions)) > 2
+    assert len(conversions) < len(set(descriptions))
+
+
+@pytest.mark.parametrize(
+    ("site_url", "auto_reload"),
+    [
+        ("https://example.org/", False),
+        (None, False),
+        ("http://127.0.0.1:8000/", True),
+        ("http://127.0.0.1:8000/docs/", True),
+    ],
+)
+def test_templates_auto_reload_only_when_serving(
+    handler: GitHubHandler, site_url: str | None, auto_reload: bool
+) -> None:
+    """Assert templates are only checked for changes while serving the documentation."""
+    tool_config = MkDocsConfig()
+    tool_config.load_dict({"site_name": "foo", "site_url": site_url})
+    assert tool_config.validate() == ([], [])
+    assert _serving(tool_config) is auto_reload
+
+    new = GitHubHandler(
+        config=handler.config,
+        repo=handler.repo,
+        serving=auto_reload,
+        theme="material",
+        custom_templates=None,
+        mdx=[],
+        mdx_config={},
+    )
+    assert new.env.auto_reload is auto_reload
+    assert not _serving({})
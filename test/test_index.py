@@ -0,0 +1,59 @@
+"""Tests for the `index` module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from mkdocstrings import CollectionError
+
+from mkdocstrings_handlers.github.index import IdentifierIndex
+
+if TYPE_CHECKING:
+    from mkdocstrings_handlers.github import GitHubHandler
+
+
+def test_index_identifiers() -> None:
+    """Assert actions are indexed by directory and workflows by path."""
+    index = IdentifierIndex(
+        [
+            "action.yml",
+            "actions/foo/action.yaml",
+            "actions/foo/action.yml",
+            "actions/bar/action.yaml",
+            ".github/workflows/ci.yml",
+            ".github/workflows/release.yaml",
+            ".github/workflows/nested/ignored.yml",
+            ".github/dependabot.yml",
+            "node/action.json",
+        ]
+    )
+    assert sorted(index) == [
+        ".",
+        ".github/workflows/ci.yml",
+        ".github/workflows/release.yaml",
+        "actions/bar",
+        "actions/foo",
+    ]
+    assert index.get("actions/foo") == "actions/foo/action.yml"
+    assert index.get("./actions/bar/") == "actions/bar/action.yaml"
+    assert index.get("actions") is None
+
+
+def test_index_suggestions() -> None:
+    """Assert close identifiers are suggested for unknown ones."""
+    index = IdentifierIndex([".github/workflows/release.yml", "actions/setup/action.yml"])
+    assert index.suggest(".github/workflows/relase.yml") == [".github/workflows/release.yml"]
+    assert index.suggest("unrelated") == []
+
+
+def test_index_from_repo(handler: GitHubHandler) -> None:
+    """Assert the handler indexes the tracked files of its repository."""
+    assert "nested/actions/deep-action" in handler.index
+    assert ".github/workflows/reusable-workflow.yml" in handler.index
+
+
+def test_collect_suggests_identifiers(handler: GitHubHandler) -> None:
+    """Assert unknown identifiers report the closest indexed identifiers."""
+    with pytest.raises(CollectionError, match="Did you mean 'actions/minimal-action'?"):
+        handler.collect("actions/minimal-actoin", {})
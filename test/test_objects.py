@@ -0,0 +1,345 @@
+"""Tests for the `objects` module."""
+
+from __future__ import annotations
+
+import pickle
+from dataclasses import replace
+from typing import TYPE_CHECKING
+
+import pytest
+
+from mkdocstrings_handlers.github import objects
+from mkdocstrings_handlers.github.config import GitHubOptions
+from mkdocstrings_handlers.github.objects import (
+    FULL,
+    Action,
+    PermissionLevel,
+    PermissionSet,
+    Projection,
+    Workflow,
+    may_be_reusable,
+    read_file,
+    scan_groups,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from mkdocstrings_handlers.github.config import PARSE_MODE
+
+
+ACTION = """\
+name: 'Test Action'
+description: 'A test action'
+inputs:
+  token: # group: auth
+    description: 'GitHub token'
+    required: true
+runs:
+  using: 'composite'
+  steps: []
+"""
+
+
+@pytest.mark.parametrize("mmap_threshold", [0, 1])
+def test_read_file(tmp_path: Path, mmap_threshold: int) -> None:
+    """Assert files are read identically with and without a memory map."""
+    file = tmp_path / "action.yml"
+    file.write_text(ACTION, encoding="utf-8")
+    assert read_file(file, mmap_threshold=mmap_threshold) == ACTION
+
+
+def test_read_file_normalizes_newlines(tmp_path: Path) -> None:
+    """Assert Windows line endings are normalized like in text mode."""
+    file = tmp_path / "action.yml"
+    file.write_bytes(ACTION.replace("\n", "\r\n").encode("utf-8"))
+    assert read_file(file) == ACTION
+
+
+def test_action_from_file(tmp_path: Path) -> None:
+    """Assert an action is parsed from the source that was read."""
+    file = tmp_path / "action.yml"
+    file.write_text(ACTION, encoding="utf-8")
+
+    action = Action.from_file(file, id=".")
+    assert action.source == ACTION
+    assert action.inputs[0].name == "token"
+    assert action.inputs[0].group == "auth"
+
+
+def test_source_is_loaded_lazily(tmp_path: Path) -> None:
+    """Assert the source is read on first access and can be released again."""
+    file = tmp_path / "action.yml"
+    file.write_text(ACTION, encoding="utf-8")
+
+    action = Action.from_file(file, id=".")
+    assert "source" not in vars(action)
+    assert action.source == ACTION
+    assert "source" in vars(action)
+    assert "source" not in pickle.loads(pickle.dumps(action)).__dict__
+
+    action.release_source()
+    assert "source" not in vars(action)
+
+
+WORKFLOW = """\
+name: 'Test Workflow'
+on:
+  workflow_call:
+    inputs:
+      environment: # group: deploy
+        description: 'Environment'
+        required: true
+        type: string
+      version:
+        # group: release
+        description: "Version: # group: not-a-group"
+        type: string
+      notes:
+        description: 'Multi-line
+          quoted: # group: not-a-group'
+        type: string
+    secrets:
+      "TOKEN": # group: auth
+        required: true
+jobs:
+  build:
+    runs-on: ubuntu-latest
+    steps:
+      - name: Build
+        run: |
+          echo "environment: # group: not-a-group"
+      - uses: actions/checkout@v4
+"""
+
+
+def test_scan_groups() -> None:
+    """Assert group comments are attributed to their key paths."""
+    groups = scan_groups(WORKFLOW)
+    assert groups == {
+        ("on", "workflow_call", "inputs", "environment"): "deploy",
+        ("on", "workflow_call", "inputs", "version"): "release",
+        ("on", "workflow_call", "secrets", "TOKEN"): "auth",
+    }
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "inputs:\n  a:\n    description: x # group: g\n",
+        "inputs:\n  a:\n    description: x\n  # group: g\n  b:\n    description: y\n",
+        "inputs:\n  a: &anchor # group: g\n    description: x\n",
+        "inputs: {\n  a: {description: x}\n}\n",
+        "---\na: 1\n---\nb: 2\n",
+    ],
+)
+def test_scan_groups_ambiguous(source: str) -> None:
+    """Assert the scan gives up on comments it cannot attribute."""
+    assert scan_groups(source) is None
+
+
+@pytest.mark.parametrize(
+    ("comments", "expected"),
+    [
+        (" # group: A1\n    # group: A2\n", "A2"),
+        (" # group: A1\n    # group: A2\n    # group: A3\n", "A3"),
+        (" # group: A1\n    # note\n", ""),
+        (" # note\n    # group: A2\n", "A2"),
+        ("\n    # group: A2\n    # group: A3\n", "A2"),
+        ("\n    # group: A2\n    # note\n", "A2"),
+    ],
+)
+def test_scan_groups_precedence(comments: str, expected: str) -> None:
+    """Assert comments on and after a key line are attributed like after a round-trip parse."""
+    source = f"name: A\ndescription: d\nruns:\n  using: node20\ninputs:\n  a:{comments}    description: x\n"
+    groups = [
+        Action.from_source(source, "action.yml", ".", mode).inputs[0].group
+        for mode in ("roundtrip", "fast", "stream")
+    ]
+    assert groups == [expected] * 3
+
+
+def test_workflow_fast_mode_matches_roundtrip(tmp_path: Path) -> None:
+    """Assert the fast mode collects the same workflow as the round-trip mode."""
+    file = tmp_path / "workflow.yml"
+    file.write_text(WORKFLOW, encoding="utf-8")
+
+    workflow = Workflow.from_file(file, id="workflow.yml", mode="fast")
+    assert workflow == Workflow.from_file(file, id="workflow.yml", mode="roundtrip")
+    assert workflow is not None
+    assert [input.group for input in workflow.inputs] == ["deploy", "release", ""]
+
+
+def test_action_fast_mode_falls_back(tmp_path: Path) -> None:
+    """Assert the fast mode falls back to round-trip parsing for ambiguous comments."""
+    file = tmp_path / "action.yml"
+    file.write_text(
+        ACTION.replace("required: true", "required: true\n  # group: other"), encoding="utf-8"
+    )
+
+    action = Action.from_file(file, id=".", mode="fast")
+    assert action == Action.from_file(file, id=".", mode="roundtrip")
+
+
+@pytest.mark.parametrize(
+    ("source", "expected"),
+    [
+        ("on: push\njobs: {}\n", False),
+        ("on:\n  push:\njobs:\n  call:\n    if: github.event_name == 'workflow_call'\n", False),
+        ("'on': [push, pull_request]\nenv:\n  X: workflow_call\n", False),
+        ("on:\n  workflow_call:\n", True),
+        ("on: [push, workflow_call]\n", True),
+        ("on: [push,\n  workflow_call]\n", True),
+        ("on: *triggers\nx: workflow_call\n", True),
+        ("{on: workflow_call}\n", True),
+    ],
+)
+def test_may_be_reusable(source: str, expected: bool) -> None:
+    """Assert the pre-scan only rejects workflows without a `workflow_call` trigger."""
+    assert may_be_reusable(source) is expected
+
+
+def test_workflow_prescan_skips_parsing(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Assert non-reusable workflows are rejected without being parsed."""
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Workflow should not be parsed.")
+
+    monkeypatch.setattr(objects, "_load", fail)
+    source = "name: CI\non:\n  push:\njobs:\n  test:\n    runs-on: ubuntu-latest\n"
+    assert Workflow.from_source(source, "ci.yml", "ci.yml") is None
+
+
+def test_workflow_stream_mode(tmp_path: Path) -> None:
+    """Assert the stream mode collects the same workflow, with `run:` scripts truncated."""
+    file = tmp_path / "workflow.yml"
+    file.write_text(WORKFLOW, encoding="utf-8")
+
+    workflow = Workflow.from_file(file, id="workflow.yml", mode="stream")
+    expected = Workflow.from_file(file, id="workflow.yml", mode="fast")
+    assert workflow is not None
+    assert expected is not None
+    assert workflow.jobs["build"].steps[0].run == 'echo "environment: # group: not-a-group"'
+    for job in expected.jobs.values():
+        job.steps = [replace(step, run=step.run.split("\n", 1)[0]) for step in job.steps]
+    assert workflow == expected
+
+
+def test_workflow_stream_mode_falls_back(tmp_path: Path) -> None:
+    """Assert the stream mode falls back to a full load for aliases."""
+    file = tmp_path / "workflow.yml"
+    file.write_text(
+        WORKFLOW.replace("runs-on: ubuntu-latest", "runs-on: ubuntu-latest\n    needs: &n []")
+        + "  test:\n    needs: *n\n",
+        encoding="utf-8",
+    )
+
+    workflow = Workflow.from_file(file, id="workflow.yml", mode="stream")
+    assert workflow == Workflow.from_file(file, id="workflow.yml", mode="fast")
+
+
+def test_projection_from_options() -> None:
+    """Assert the projection follows the options that render each part."""
+    assert Projection.from_options(GitHubOptions()) == Projection(
+        jobs=False, permissions=True, outputs=False, secrets=True
+    )
+    assert Projection.from_options(
+        GitHubOptions(show_signature=False, show_secrets=False, workflow_chart=True)
+    ) == Projection(jobs=True, permissions=False, outputs=False, secrets=False)
+
+
+def test_projection_covers() -> None:
+    """Assert a projection covers the projections it includes, and unions include both."""
+    narrow = Projection(jobs=False, permissions=True, outputs=False, secrets=False)
+    other = Projection(jobs=True, permissions=False, outputs=False, secrets=False)
+    assert FULL.covers(narrow)
+    assert not narrow.covers(other)
+    assert (narrow | other).covers(narrow)
+    assert (narrow | other).covers(other)
+
+
+@pytest.mark.parametrize("mode", ["roundtrip", "fast", "stream"])
+def test_workflow_projection(tmp_path: Path, mode: PARSE_MODE) -> None:
+    """Assert parts outside of the projection are not collected."""
+    file = tmp_path / "workflow.yml"
+    file.write_text(WORKFLOW + "permissions:\n  contents: read\n", encoding="utf-8")
+    narrow = Projection(jobs=False, permissions=False, outputs=False, secrets=False)
+
+    workflow = Workflow.from_file(file, id="workflow.yml", mode=mode, projection=narrow)
+    assert workflow is not None
+    assert workflow.projection == narrow
+    assert [input.name for input in workflow.inputs] == ["environment", "version", "notes"]
+    assert workflow.secrets == []
+    assert workflow.permissions == {}
+    assert workflow.jobs == {}
+
+    workflow = Workflow.from_file(file, id="workflow.yml", mode=mode)
+    assert workflow is not None
+    assert workflow.secrets
+    assert workflow.permissions
+    assert workflow.jobs
+
+
+def test_parameters_share_interned_strings(tmp_path: Path) -> None:
+    """Assert parameters are slotted and share repeated strings across files."""
+    first = tmp_path / "first.yml"
+    second = tmp_path / "second.yml"
+    first.write_text(ACTION, encoding="utf-8")
+    second.write_text(ACTION.replace("Test Action", "Other Action"), encoding="utf-8")
+
+    input_1 = Action.from_file(first, id="first").inputs[0]
+    input_2 = Action.from_file(second, id="second").inputs[0]
+    assert not hasattr(input_1, "__dict__")
+    assert input_1.group is input_2.group
+    assert input_1.description is input_2.description
+
+
+def test_permission_set() -> None:
+    """Assert permission sets merge to the highest level and keep the order of their scopes."""
+    workflow = PermissionSet.parse({"contents": "read", "issues": "write"})
+    job = PermissionSet.parse({"custom-scope": "read", "contents": "write", "pages": "none"})
+    merged = workflow | job
+
+    assert list(merged.items()) == [
+        ("contents", PermissionLevel.write),
+        ("issues", PermissionLevel.write),
+        ("custom-scope", PermissionLevel.read),
+        ("pages", PermissionLevel.none),
+    ]
+    assert "custom-scope" in merged
+    assert "statuses" not in merged
+    assert merged == {"contents": PermissionLevel.write, "issues": PermissionLevel.write} | {
+        "custom-scope": PermissionLevel.read,
+        "pages": PermissionLevel.none,
+    }
+    assert pickle.loads(pickle.dumps(merged)) == merged
+    assert not merged.read_all
+
+
+def test_permission_set_all() -> None:
+    """Assert `read-all` and `write-all` are recognized regardless of other scopes."""
+    read_all = PermissionSet.parse("read-all")
+    assert read_all.read_all
+    assert not read_all.write_all
+    assert (read_all | PermissionSet.parse({"other": "write"})).read_all
+    assert not (read_all | PermissionSet.parse({"contents": "write"})).read_all
+    assert PermissionSet.parse("write-all").write_all
+
+
+def test_workflow_job_permissions(tmp_path: Path) -> None:
+    """Assert the permissions of every job are kept next to the merged permissions."""
+    file = tmp_path / "workflow.yml"
+    file.write_text(
+        "name: Test\non:\n  workflow_call:\npermissions:\n  contents: read\n"
+        "jobs:\n  a:\n    permissions:\n      contents: write\n  b:\n    permissions: read-all\n"
+        "  c:\n    runs-on: ubuntu-latest\n",
+        encoding="utf-8",
+    )
+
+    workflow = Workflow.from_file(file, "workflow.yml")
+    assert workflow is not None
+    assert workflow.job_permissions == {
+        "a": {"contents": PermissionLevel.write},
+        "b": PermissionSet.all(PermissionLevel.read),
+    }
+    assert workflow.permission_read_all
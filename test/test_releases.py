@@ -0,0 +1,186 @@
+"""Tests for the `releases` module."""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+import git
+import pytest
+from pydantic import ValidationError
+
+from mkdocstrings_handlers.github import releases
+from mkdocstrings_handlers.github.config import GitHubOptions
+from mkdocstrings_handlers.github.releases import (
+    ENV_MAJOR_TAG,
+    ENV_SEMVER_TAG,
+    Releases,
+    VersionSnapshot,
+    index_releases,
+    latest_releases,
+    read_tags,
+)
+from mkdocstrings_handlers.github.repository import Repository
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from mkdocstrings_handlers.github import GitHubHandler
+
+SHA = "0" * 40
+
+
+def test_read_tags(tmp_path: Path) -> None:
+    """Assert tags are read from both `packed-refs` and loose refs."""
+    (tmp_path / "packed-refs").write_text(
+        "# pack-refs with: peeled fully-peeled sorted\n"
+        f"{SHA} refs/heads/main\n"
+        f"{SHA} refs/tags/v1.0.0\n"
+        f"^{SHA}\n"
+        f"{SHA} refs/tags/v1\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "refs" / "tags" / "nested").mkdir(parents=True)
+    (tmp_path / "refs" / "tags" / "v1.1.0").write_text(SHA, encoding="utf-8")
+    (tmp_path / "refs" / "tags" / "nested" / "tag").write_text(SHA, encoding="utf-8")
+
+    assert sorted(read_tags(tmp_path)) == ["nested/tag", "v1", "v1.0.0", "v1.1.0"]
+
+
+def test_read_tags_cached_until_modified(tmp_path: Path) -> None:
+    """Assert tags are read again only when the refs change."""
+    tags_dir = tmp_path / "refs" / "tags"
+    tags_dir.mkdir(parents=True)
+    (tags_dir / "v1").write_text(SHA, encoding="utf-8")
+    os.utime(tags_dir, ns=(0, 0))
+    assert read_tags(tmp_path) is read_tags(tmp_path)
+
+    (tags_dir / "v2").write_text(SHA, encoding="utf-8")
+    os.utime(tags_dir, ns=(1, 1))
+    assert sorted(read_tags(tmp_path)) == ["v1", "v2"]
+
+
+def test_latest_releases() -> None:
+    """Assert the highest versions are selected, comparing numbers and not strings."""
+    tags = ["v1.9.0", "v1.10.0", "v2", "v10", "v9", "release", "v1.2", "v1.10.0-rc1"]
+    assert latest_releases(tags) == ("v1.10.0", "v10")
+    assert latest_releases([]) == ("", "")
+
+
+def test_releases_resolved_lazily(handler: GitHubHandler, monkeypatch) -> None:
+    """Assert tags are only read when a release tag is used."""
+    assert handler.releases._semver is None
+    assert handler.releases._major is None
+
+    calls = []
+    monkeypatch.setattr(releases, "read_tags", lambda git_dir: calls.append(git_dir) or ["v2"])
+    assert handler.major == "v2"
+    assert handler.semver == ""
+    assert len(calls) == 1
+
+
+def _repository(tmp_path: Path) -> tuple[git.Repo, Repository]:
+    repo = git.Repo.init(tmp_path, initial_branch="main")
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "Test")
+        config.set_value("user", "email", "test@example.com")
+    (tmp_path / "action.yml").write_text("name: Action\n", encoding="utf-8")
+    repo.index.add(["action.yml"])
+    repo.index.commit("Initial commit")
+    return repo, Repository.open(tmp_path)
+
+
+def test_version_snapshot_ref_from_ci() -> None:
+    """Assert the pull request branch takes precedence over the ref name in CI."""
+    environ = {"GITHUB_REF_NAME": "12/merge", "GITHUB_HEAD_REF": "feature"}
+    assert VersionSnapshot(None, None, environ).ref == "feature"
+    assert (
+        VersionSnapshot(None, None, {"GITHUB_REF_NAME": "v1.0.0", "GITHUB_HEAD_REF": ""}).ref
+        == "v1.0.0"
+    )
+
+
+def test_version_snapshot_ref_detached(tmp_path: Path) -> None:
+    """Assert a detached HEAD uses the release tag pointing to it, or its short SHA."""
+    repo, repository = _repository(tmp_path)
+    assert VersionSnapshot(repository, None, {}).ref == "main"
+
+    sha = repo.head.commit.hexsha
+    repo.head.reference = repo.head.commit
+    assert VersionSnapshot(repository, None, {}).ref == sha[:7]
+
+    repo.create_tag("v1")
+    repo.create_tag("v1.2.0", message="Annotated")
+    repo.git.pack_refs("--all")
+    assert repository.tags_at(sha) == ["v1", "v1.2.0"]
+    assert VersionSnapshot(repository, None, {}).ref == "v1.2.0"
+
+
+def test_version_snapshot_resolved_once(handler: GitHubHandler, monkeypatch) -> None:
+    """Assert release tags are resolved once, only when used, and can be overridden."""
+    calls = []
+    monkeypatch.setattr(releases, "read_tags", lambda git_dir: calls.append(git_dir) or ["v3"])
+    snapshot = VersionSnapshot(handler.repo, Releases(handler.repo), {ENV_SEMVER_TAG: "v9.9.9"})
+    assert snapshot.semver == "v9.9.9"
+    assert calls == []
+    assert snapshot.version(GitHubOptions(signature_version="major")) == "v3"
+    assert snapshot.version(GitHubOptions(signature_version="major")) == "v3"
+    assert len(calls) == 1
+    options = GitHubOptions(signature_version="string", signature_version_string="next")
+    assert snapshot.version(options) == "next"
+
+
+def test_index_releases() -> None:
+    """Assert the latest releases of every prefix are indexed in one pass."""
+    tags = [
+        "v1",
+        "v1.0.0",
+        "setup-node/v1.4.2",
+        "setup-node/v1.10.0",
+        "setup-node/v1",
+        "setup-node/v2",
+        "node-v3",
+    ]
+    assert index_releases(tags) == {
+        "": ("v1.0.0", "v1"),
+        "setup-node/": ("setup-node/v1.10.0", "setup-node/v2"),
+        "node-": ("", "node-v3"),
+    }
+
+
+def test_version_snapshot_tag_prefix(handler: GitHubHandler, monkeypatch) -> None:
+    """Assert the releases of an identifier are selected by the tag prefix."""
+    tags = ["v9", "v9.0.0", "setup-node/v1", "setup-node/v1.4.2", "ci/v2"]
+    monkeypatch.setattr(releases, "read_tags", lambda git_dir: tags)
+    snapshot = VersionSnapshot(handler.repo, Releases(handler.repo), {ENV_MAJOR_TAG: "v0"})
+
+    options = GitHubOptions(signature_version="major", signature_tag_prefix="{name}/")
+    assert snapshot.version(options, "actions/setup-node") == "setup-node/v1"
+    assert snapshot.version(options, ".github/workflows/ci.yml") == "ci/v2"
+    assert snapshot.version(options, "unreleased") == ""
+    options = GitHubOptions(signature_version="semver", signature_tag_prefix="{id}/")
+    assert snapshot.version(options, "setup-node") == "setup-node/v1.4.2"
+    assert snapshot.version(GitHubOptions(signature_version="major"), "setup-node") == "v0"
+    # Other spellings of an identifier select the same tags.
+    assert snapshot.version(options, "./setup-node/") == "setup-node/v1.4.2"
+    options = GitHubOptions(signature_version="major", signature_tag_prefix="{name}/")
+    assert snapshot.version(options, "./actions/setup-node/") == "setup-node/v1"
+
+
+@pytest.mark.parametrize("prefix", ["{version}/", "{0}-", "{name"])
+def test_invalid_tag_prefix(prefix: str) -> None:
+    """Assert unknown placeholders are reported as invalid options, not when rendering."""
+    with pytest.raises(ValidationError, match="placeholders"):
+        GitHubOptions(signature_tag_prefix=prefix)
+
+
+def test_deprecated_tag_globals(handler: GitHubHandler) -> None:
+    """Assert templates overridden by users can still use the `semver_tag` and `major_tag` globals."""
+    handler.versions = VersionSnapshot(
+        handler.repo, Releases(handler.repo), {ENV_MAJOR_TAG: "v2", ENV_SEMVER_TAG: "v2.1.0"}
+    )
+    handler.update_env({})
+    template = handler.env.from_string(
+        "{{ semver_tag }} {{ major_tag == 'v2' }} {{ semver_tag.startswith('v2.') }} {{ 'x' + major_tag }}"
+    )
+    assert template.render() == "v2.1.0 True True xv2"
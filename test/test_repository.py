@@ -0,0 +1,152 @@
+"""Tests for the built-in git metadata reader."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import git
+import pytest
+
+from mkdocstrings_handlers.github.repository import Repository, parse_config, read_index
+
+
+@pytest.fixture
+def git_repo(tmp_path: Path) -> git.Repo:
+    """A repository with a commit, an action and a workflow."""
+    repo = git.Repo.init(tmp_path / "repo", initial_branch="main")
+    root = tmp_path / "repo"
+    (root / "actions" / "setup").mkdir(parents=True)
+    (root / "actions" / "setup" / "action.yml").write_text("name: Setup\n", encoding="utf-8")
+    (root / ".github" / "workflows").mkdir(parents=True)
+    (root / ".github" / "workflows" / "ci.yml").write_text("on: push\n", encoding="utf-8")
+    repo.index.add(["actions/setup/action.yml", ".github/workflows/ci.yml"])
+    repo.index.commit("Initial commit")
+    return repo
+
+
+def test_parse_config() -> None:
+    """Assert sections, subsections, quoting and comments are parsed like git does."""
+    text = """
+[core]
+\tbare = false ; comment
+[remote "origin"]
+\turl = git@github.com:owner/repo.git
+\tfetch = +refs/heads/*:refs/remotes/origin/*
+[Remote "Up Stream"]
+\tURL = "https://github.com/owner/repo#1" # comment
+[branch.main] remote = origin
+"""
+    assert parse_config(text) == [
+        ("core", "bare", "false"),
+        ("remote.origin", "url", "git@github.com:owner/repo.git"),
+        ("remote.origin", "fetch", "+refs/heads/*:refs/remotes/origin/*"),
+        ("remote.Up Stream", "url", "https://github.com/owner/repo#1"),
+        ("branch.main", "remote", "origin"),
+    ]
+
+
+def test_open_from_subdirectory(git_repo: git.Repo) -> None:
+    """Assert the repository is found from a subdirectory of its working tree."""
+    repository = Repository.open(Path(git_repo.working_tree_dir, "actions", "setup"))
+    assert repository.working_tree_dir == git_repo.working_tree_dir
+    assert repository.git_dir == repository.common_dir == git_repo.git_dir
+    assert repository.branch == "main"
+
+
+def test_open_not_a_repository(tmp_path: Path) -> None:
+    """Assert GitPython's error is raised outside of a repository."""
+    with pytest.raises(git.InvalidGitRepositoryError):
+        Repository.open(tmp_path)
+
+
+def test_detached_head(git_repo: git.Repo) -> None:
+    """Assert there is no branch when the HEAD is detached."""
+    git_repo.head.reference = git_repo.head.commit
+    assert Repository.open(Path(git_repo.working_tree_dir)).branch is None
+
+
+def test_worktree(git_repo: git.Repo, tmp_path: Path) -> None:
+    """Assert worktrees, whose `.git` is a `gitdir:` file, share the config of the main repository."""
+    git_repo.create_remote("origin", "git@github.com:owner/repo.git")
+    git_repo.git.worktree("add", "-b", "feature", str(tmp_path / "worktree"))
+
+    repository = Repository.open(tmp_path / "worktree")
+    assert repository.working_tree_dir == str(tmp_path / "worktree")
+    assert repository.common_dir == git_repo.git_dir
+    assert repository.git_dir != repository.common_dir
+    assert repository.branch == "feature"
+    assert repository.remote_urls() == ["git@github.com:owner/repo.git"]
+    assert sorted(repository.tracked_files()) == [
+        ".github/workflows/ci.yml",
+        "actions/setup/action.yml",
+    ]
+
+
+def test_remote_urls(git_repo: git.Repo) -> None:
+    """Assert the URLs of all remotes are returned in configuration order."""
+    git_repo.create_remote("origin", "https://github.com/owner/repo.git")
+    git_repo.create_remote("fork", "git@github.com:fork/repo.git")
+    repository = Repository.open(Path(git_repo.working_tree_dir))
+    assert repository.remote_urls() == [
+        "https://github.com/owner/repo.git",
+        "git@github.com:fork/repo.git",
+    ]
+
+
+@pytest.mark.parametrize("version", [2, 3, 4])
+def test_tracked_files(git_repo: git.Repo, version: int) -> None:
+    """Assert all index versions are read, including version 4 which GitPython does not support."""
+    root = Path(git_repo.working_tree_dir)
+    for name in ("a", "ab", "abc", "b/long-" + "x" * 40):
+        (root / name).parent.mkdir(exist_ok=True)
+        (root / name).write_text(name, encoding="utf-8")
+    git_repo.git.add(".")
+    if version == 3:
+        # Intent-to-add entries use the extended flags, which require version 3.
+        (root / "new").write_text("new", encoding="utf-8")
+        git_repo.git.add("--intent-to-add", "new")
+    git_repo.git.update_index("--index-version", str(version))
+
+    expected = git_repo.git.ls_files("--cached").splitlines()
+    assert Repository.open(root).tracked_files() == expected
+
+
+@pytest.mark.parametrize("version", [2, 4])
+def test_tracked_files_split_index(git_repo: git.Repo, version: int) -> None:
+    """Assert split indexes are merged with their shared index, with replaced, deleted and added entries."""
+    root = Path(git_repo.working_tree_dir)
+    for index in range(10):
+        (root / f"file-{index}").write_text(str(index), encoding="utf-8")
+    git_repo.git.add(".")
+    git_repo.git.config("core.splitIndex", "true")
+    git_repo.git.config("splitIndex.maxPercentChange", "100")
+    git_repo.git.update_index("--index-version", str(version))
+    git_repo.git.update_index("--split-index")
+    (root / "file-3").write_text("changed", encoding="utf-8")
+    (root / "file-a").write_text("added", encoding="utf-8")
+    git_repo.git.add("file-3", "file-a")
+    git_repo.git.rm("--cached", "file-5")
+
+    git_dir = Path(git_repo.git_dir)
+    assert list(git_dir.glob("sharedindex.*"))
+    expected = git_repo.git.ls_files("--cached").splitlines()
+    assert "file-5" not in expected
+    # Read without falling back to `git ls-files`.
+    assert read_index(git_dir / "index") == expected
+    assert Repository.open(root).tracked_files() == expected
+
+
+def test_blob_sha256_repository(tmp_path: Path) -> None:
+    """Assert reading objects of a SHA-256 repository fails explicitly."""
+    repo = git.Repo.init(tmp_path, object_format="sha256")
+    (tmp_path / "action.yml").write_text("name: Action\n", encoding="utf-8")
+    repo.git.config("user.name", "Test")
+    repo.git.config("user.email", "test@example.com")
+    repo.git.add("action.yml")
+    repo.git.commit("-m", "Initial commit")
+    repository = Repository.open(tmp_path)
+
+    assert repository.hash_size == 32
+    assert repository.tracked_files() == ["action.yml"]
+    with pytest.raises(ValueError, match="SHA-256"):
+        repository.blob("HEAD", "action.yml")
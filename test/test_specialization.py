@@ -0,0 +1,72 @@
+"""Tests for the `specialization` module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from jinja2 import DictLoader, Environment
+
+from mkdocstrings_handlers.github.config import GitHubOptions
+from mkdocstrings_handlers.github.specialization import specialize
+
+if TYPE_CHECKING:
+    from mkdocstrings_handlers.github import GitHubHandler
+
+
+@pytest.mark.parametrize(
+    ("source", "expected"),
+    [
+        ("{% if options.show_source %}a{% else %}b{% endif %}", "b"),
+        (
+            "{% if options.show_source %}a{% elif not x %}b{% elif options.show_inputs %}c{% endif %}",
+            "c",
+        ),
+        ("{% if not options.show_source and x %}a{% else %}b{% endif %}", "a"),
+        ("{{ options.description if options.description else x }}", "1"),
+        ("{{ 'table' if options.parameters_section_style == 'table' else 'list' }}", "table"),
+        ("{% set n = 1 %}{% if options.show_inputs %}{% set n = 2 %}{% endif %}{{ n }}", "2"),
+    ],
+)
+def test_specialized_templates_render_the_same(source: str, expected: str) -> None:
+    """Assert folding the options in does not change the output."""
+    options = GitHubOptions(show_source=False, show_inputs=True)
+    environment = Environment(loader=DictLoader({"template": source}))
+    variant = specialize(environment, options)
+
+    assert environment.get_template("template").render(options=options, x=1) == expected
+    assert variant.get_template("template").render(options=options, x=1) == expected
+    assert "options" not in variant.compile(source, raw=True)
+
+
+def test_included_templates_are_specialized() -> None:
+    """Assert templates loaded by the specialized ones are specialized too."""
+    templates = {
+        "main": '{% include "section" %}',
+        "section": "{% if options.show_source %}{{ data.source }}{% endif %}",
+    }
+    variant = specialize(Environment(loader=DictLoader(templates)), GitHubOptions())
+
+    assert variant.get_template("main").render(data=None) == ""
+
+
+def test_templates_assigning_options_are_not_specialized() -> None:
+    """Assert templates that assign `options` keep reading it at render time."""
+    source = "{% set options = other %}{% if options.show_source %}a{% endif %}"
+    variant = specialize(Environment(), GitHubOptions(show_source=False))
+
+    assert variant.from_string(source).render(other=GitHubOptions(show_source=True)) == "a"
+
+
+def test_render_uses_one_variant_per_options(handler: GitHubHandler) -> None:
+    """Assert objects rendered with the same options share a specialized environment."""
+    preloaded = len(handler.variants)
+    options = handler.get_options({"show_source": False})
+    for identifier in ("actions/simple-action", ".github/workflows/reusable-workflow.yml"):
+        data = handler.collect(identifier, options)
+        assert data is not None
+        handler.render(data, options)
+    assert len(handler.variants) == preloaded + 1
+    # The templates for the global options were compiled ahead of the first render.
+    handler.render(data, handler.get_options({}))
+    assert len(handler.variants) == preloaded + 1
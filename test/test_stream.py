@@ -0,0 +1,84 @@
+"""Tests for the `stream` module."""
+
+from __future__ import annotations
+
+import pytest
+
+from mkdocstrings_handlers.github.stream import ALL, UnsupportedStream, load_partial
+
+SOURCE = """\
+name: Example
+on:
+  push:
+    branches: [main]
+  workflow_call:
+    inputs:
+      count: {type: number, default: 0x10, required: true}
+jobs:
+  build:
+    runs-on: ubuntu-latest
+    steps:
+      - name: Build
+        run: |
+          echo build
+          echo more
+"""
+
+
+def test_load_partial() -> None:
+    """Assert only the selected nodes are loaded, and other keys are kept without values."""
+    data = load_partial(
+        SOURCE,
+        {
+            "name": ALL,
+            "on": {"workflow_call": ALL},
+            "jobs": {"*": {"steps": {"name": ALL, "run": str.upper}}},
+        },
+    )
+    assert data == {
+        "name": "Example",
+        "on": {
+            "push": None,
+            "workflow_call": {
+                "inputs": {"count": {"type": "number", "default": 16, "required": True}}
+            },
+        },
+        "jobs": {
+            "build": {
+                "runs-on": None,
+                "steps": [{"name": "Build", "run": "ECHO BUILD\nECHO MORE\n"}],
+            }
+        },
+    }
+
+
+def test_load_partial_matches_full_load() -> None:
+    """Assert loading everything gives the same result as the safe loader."""
+    from ruamel.yaml import YAML
+
+    assert load_partial(SOURCE, ALL) == YAML(typ="safe", pure=False).load(SOURCE)
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "a: &anchor {b: 1}\nc: *anchor\n",
+        "a: {b: 1}\n<<: {c: 2}\n",
+        "a: !!str 1\n",
+        "? [a, b]\n: c\n",
+        "a: 1\n---\nb: 2\n",
+    ],
+)
+def test_load_partial_unsupported(source: str) -> None:
+    """Assert features that need the full document are reported."""
+    with pytest.raises(UnsupportedStream):
+        load_partial(source, ALL)
+
+
+def test_load_partial_skips_unsupported_features() -> None:
+    """Assert unsupported features are fine in skipped nodes."""
+    assert load_partial("a: &anchor {b: 1}\nc: *anchor\nd: 1\n", {"d": ALL}) == {
+        "a": None,
+        "c": None,
+        "d": 1,
+    }
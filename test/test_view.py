@@ -0,0 +1,82 @@
+"""Tests for the `view` module."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from mkdocstrings_handlers.github.config import GitHubOptions
+from mkdocstrings_handlers.github.objects import Input, Output, Secret, Workflow
+from mkdocstrings_handlers.github.view import build_view
+
+if TYPE_CHECKING:
+    from mkdocstrings_handlers.github import GitHubHandler
+
+WORKFLOW = Workflow(
+    file=Path(".github/workflows/deploy.yml"),
+    id=".github/workflows/deploy.yml",
+    name="Deploy",
+    description="Deploy the site.",
+    inputs=[
+        Input("target", "Where to deploy.", required=True, group="Deployment"),
+        Input("dry-run", "Only print the changes.", default=False),
+        Input("environment", "The environment.", required=True, default="prod"),
+    ],
+    secrets=[Secret("token", "The token.", required=True), Secret("key", "The key.")],
+    outputs=[Output("url", "The URL.", group="Deployment")],
+)
+
+
+def test_build_view() -> None:
+    """Assert parameters are ordered, filtered and grouped like the templates expect."""
+    options = GitHubOptions(parameters_order="alphabetical", show_inputs_only_required=True)
+    view = build_view(WORKFLOW, options)
+
+    assert [i.name for i in view.signature_inputs] == ["environment", "target"]
+    assert [s.name for s in view.signature_secrets] == ["token"]
+    assert [(group, [i.name for i in inputs]) for group, inputs in view.inputs.groups] == [
+        ("", ["environment"]),
+        ("Deployment", ["target"]),
+    ]
+    assert view.inputs.default_column
+    assert view.inputs.anchors["target"] == ".github/workflows/deploy.yml--inputs.target"
+    assert view.inputs.header_id == "inputs-github-workflows-deployyml"
+    assert [s.name for s in view.secrets.parameters] == ["key", "token"]
+
+
+def test_build_view_hidden_sections() -> None:
+    """Assert hidden sections and overridden descriptions are not converted."""
+    options = GitHubOptions(
+        show_signature=False, show_outputs=False, description="Overridden.", parameters_groups=False
+    )
+    view = build_view(WORKFLOW, options)
+
+    assert not view.signature_inputs
+    assert not view.outputs.parameters
+    assert [group for group, _inputs in view.inputs.groups] == [""]
+    assert view.descriptions() == {
+        "": [],
+        WORKFLOW.id: [
+            "Where to deploy.",
+            "Only print the changes.",
+            "The environment.",
+            "The token.",
+            "The key.",
+        ],
+    }
+
+
+def test_macros_keep_their_arguments(handler: GitHubHandler) -> None:
+    """Assert templates overridden by users can call the macros without a view."""
+    options = GitHubOptions(parameters_anchors=True)
+    view = build_view(WORKFLOW, options)
+    template = handler.env.from_string(
+        '{% from "_macros.html.jinja" import render_grouped_list %}'
+        '{{ render_grouped_list(items, "inputs", options, data) }}|'
+        '{{ render_grouped_list(items, "inputs", options, data, section.groups, section.anchors) }}'
+    )
+    old, new = template.render(
+        items=WORKFLOW.inputs, section=view.inputs, options=options, data=WORKFLOW
+    ).split("|")
+    assert 'href="#.github/workflows/deploy.yml--inputs.target"' in old
+    assert old == new